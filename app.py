@@ -1,248 +1,234 @@
-from flask import Flask, render_template_string, request, jsonify
-import os, re, time, sys
-import webview
+from flask import Flask, Response, abort, render_template_string, request, jsonify, stream_with_context, url_for
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import functools, hmac, json, os, time
 
-# Location awareness for PyInstaller portable wrapper
-if getattr(sys, 'frozen', False):
-    basedir = sys._MEIPASS
-else:
-    basedir = os.path.dirname(os.path.abspath(__file__))
+from config import (
+    basedir, LOGO_PATH, CHECK_DELAY, BATCH_WORKERS, BATCH_MAX_IN_FLIGHT, RANGE_MAX_AGE, ADMIN_TOKEN,
+    THEME_COLOR, PRIMARY_DARK, SECONDARY_COLOR, BACKGROUND_COLOR, SURFACE_COLOR, SURFACE_LIGHT,
+    TEXT_COLOR, TEXT_SECONDARY, DANGER_COLOR, WARNING_COLOR, SUCCESS_COLOR, INFO_COLOR,
+)
+from evaluation import (
+    NDJSON_MIMETYPES, add_base_word, analyze_batch_item, analyze_password_cached, analyze_password_progressive,
+    get_cache, get_filter, get_range_bucket, parse_batch_line, server_sent_event,
+)
+import banned_lists, metrics, page_assets, process_memory, profiler, range_buckets
 
 app = Flask(__name__, static_folder=os.path.join(basedir, "static"))
+_batch_executor = ThreadPoolExecutor(BATCH_WORKERS, thread_name_prefix="passmimi-batch")
 
-# ========================== CONFIGURATION ==========================
-LOGO_PATH = os.path.join(basedir, "static", "logo.png")
-WORDLIST_PATHS = [
-    os.path.join(basedir, "wordlists", "rockyou.txt"),
-    os.path.join(basedir, "wordlists", "SecLists"),
-    os.path.join(basedir, "wordlists", "Weakpass.txt")
-]
-THEME_COLOR = "#00f7ff"
-PRIMARY_DARK = "#00c4cc"
-SECONDARY_COLOR = "#8a2be2"
-BACKGROUND_COLOR = "#0a0f1c"
-SURFACE_COLOR = "#121a2e"
-SURFACE_LIGHT = "#1a243c"
-TEXT_COLOR = "#e0ffff"
-TEXT_SECONDARY = "#a0b3c6"
-DANGER_COLOR = "#ff4757"
-WARNING_COLOR = "#ffa502"
-SUCCESS_COLOR = "#23ac5c"
-INFO_COLOR = "#1e90ff"
-
-# ========================== WORDLIST CHECK ==========================
-def check_in_wordlists(password):
-    found_lists = []
-    for path in WORDLIST_PATHS:
-        if not os.path.exists(path):
-            continue
-        if os.path.isdir(path):
-            for root, _, files in os.walk(path):
-                for file in files:
-                    full_path = os.path.join(root, file)
-                    try:
-                        with open(full_path, "r", encoding="latin-1", errors="ignore") as f:
-                            # Use a more efficient check
-                            if f'{password}\n' in f.read():
-                                if "SecLists" not in found_lists:
-                                    found_lists.append("SecList") # Simplified for speed
-                                return found_lists
-                    except Exception:
-                        continue
-        else:
-            try:
-                with open(path, "r", encoding="latin-1", errors="ignore") as f:
-                      if f'{password}\n' in f.read():
-                          found_lists.append(os.path.basename(path))
-                          return found_lists
-            except Exception:
-                continue
-    return found_lists
-
-# ========================== EVALUATION LOGIC ==========================
-def evaluate_password(password):
-    length = len(password)
-    has_upper = any(c.isupper() for c in password)
-    upper_count = sum(1 for c in password if c.isupper())
-    has_lower = any(c.islower() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    digit_count = sum(1 for c in password if c.isdigit())
-    symbols = re.findall(r"[!@#$%^&*(),.?\":{}|<>]", password)
-    symbol_count = len(symbols)
-
-    # Rule 7: Check wordlists first - if found, rating is 1
-    found_lists = check_in_wordlists(password)
-    if found_lists:
-        return {
-            "rating": 1,
-            "strength": "Very Weak",
-            "circle_color": DANGER_COLOR,
-            "remark": f"⚠️ Found in wordlists ({', '.join(found_lists)})",
-            "details": {
-                "Uppercase": has_upper, 
-                "Lowercase": has_lower, 
-                "Digits": has_digit, 
-                "Symbols": symbol_count,
-                "Length": length
-            },
-            "suggestion": "Password found in known data breaches; change immediately.",
-        }
+# ========================== ROUTES ==========================
+_page = None
 
-    # Rule 1: Under 6 characters
-    if length < 6:
-        return {
-            "rating": 1, 
-            "strength": "Very Weak", 
-            "circle_color": DANGER_COLOR,
-            "remark": "Password is too short", 
-            "details": {
-                "Uppercase": has_upper, 
-                "Lowercase": has_lower, 
-                "Digits": has_digit, 
-                "Symbols": symbol_count,
-                "Length": length
-            },
-            "suggestion": "Increase password length to at least 6 characters."
-        }
-    
-    # Rule 2: 6 to 10 characters
-    elif 6 <= length <= 10:
-        return {
-            "rating": 2, 
-            "strength": "Weak", 
-            "circle_color": "#ff6633",
-            "remark": "Password is too short", 
-            "details": {
-                "Uppercase": has_upper, 
-                "Lowercase": has_lower, 
-                "Digits": has_digit, 
-                "Symbols": symbol_count,
-                "Length": length
-            },
-            "suggestion": "Increase password length to at least 12 characters and add complexity."
-        }
-    
-    # Rule 3: 10 to 25 without symbols and uppercase
-    elif 10 < length <= 25 and (not has_upper or symbol_count == 0):
-        return {
-            "rating": 5, 
-            "strength": "Moderate", 
-            "circle_color": WARNING_COLOR,
-            "remark": "Password lacks complexity", 
-            "details": {
-                "Uppercase": has_upper, 
-                "Lowercase": has_lower, 
-                "Digits": has_digit, 
-                "Symbols": symbol_count,
-                "Length": length
-            },
-            "suggestion": "Add uppercase letters and special symbols to increase strength."
-        }
-    
-    # Rule 5: 22 to 30+ with symbols (at least 3) and uppercase (at least 2) and numbers (at least 3)
-    # Checked before Rule 4 to ensure the strictest condition isn't skipped by overlapping length constraints
-    elif length >= 22 and symbol_count >= 3 and upper_count >= 2 and digit_count >= 3:
-        return {
-            "rating": 10, 
-            "strength": "Very Strong", 
-            "circle_color": THEME_COLOR,
-            "remark": "Excellent password security!", 
-            "details": {
-                "Uppercase": has_upper, 
-                "Lowercase": has_lower, 
-                "Digits": has_digit, 
-                "Symbols": symbol_count,
-                "Length": length
-            },
-            "suggestion": "Perfect! This password meets all security criteria."
-        }
-        
-    # Rule 4: 18 to 25 with symbol and uppercase (and at least 3 numbers)
-    elif 18 <= length <= 25 and has_upper and symbol_count >= 1 and digit_count >= 3:
-        return {
-            "rating": 8, 
-            "strength": "Strong", 
-            "circle_color": SUCCESS_COLOR,
-            "remark": "Strong password with good complexity", 
-            "details": {
-                "Uppercase": has_upper, 
-                "Lowercase": has_lower, 
-                "Digits": has_digit, 
-                "Symbols": symbol_count,
-                "Length": length
-            },
-            "suggestion": "Excellent password! Consider making it longer for even better security."
-        }
-    
-    # Default case for passwords that don't match specific rules
-    else:
-        return {
-            "rating": 6, 
-            "strength": "Good", 
-            "circle_color": "#00ffcc",
-            "remark": "Password is good but could be stronger", 
-            "details": {
-                "Uppercase": has_upper, 
-                "Lowercase": has_lower, 
-                "Digits": has_digit, 
-                "Symbols": symbol_count,
-                "Length": length
-            },
-            "suggestion": "Add more character variety (uppercase, numbers, symbols) and increase length."
-        }
+def _render_page():
+    # Rendered on the first request, which provides the URL context; the
+    # theme never changes at runtime so every later view reuses the result
+    global _page
+    if _page is None:
+        html = render_template_string(TEMPLATE,
+                                      logo_available=os.path.exists(LOGO_PATH),
+                                      logo_path=LOGO_PATH,
+                                      theme_color=THEME_COLOR,
+                                      primary_dark=PRIMARY_DARK,
+                                      secondary_color=SECONDARY_COLOR,
+                                      background_color=BACKGROUND_COLOR,
+                                      surface_color=SURFACE_COLOR,
+                                      surface_light=SURFACE_LIGHT,
+                                      text_color=TEXT_COLOR,
+                                      text_secondary=TEXT_SECONDARY,
+                                      danger_color=DANGER_COLOR,
+                                      warning_color=WARNING_COLOR,
+                                      success_color=SUCCESS_COLOR,
+                                      info_color=INFO_COLOR)
+        _page = page_assets.build_assets(html, lambda name: url_for("page_asset", name=name))
+    return _page
 
-# ========================== ROUTES ==========================
 @app.route("/")
 def index():
-    logo_available = os.path.exists(LOGO_PATH)
-    return render_template_string(TEMPLATE, 
-                                  logo_available=logo_available, 
-                                  logo_path=LOGO_PATH,
-                                  theme_color=THEME_COLOR,
-                                  primary_dark=PRIMARY_DARK,
-                                  secondary_color=SECONDARY_COLOR,
-                                  background_color=BACKGROUND_COLOR,
-                                  surface_color=SURFACE_COLOR,
-                                  surface_light=SURFACE_LIGHT,
-                                  text_color=TEXT_COLOR,
-                                  text_secondary=TEXT_SECONDARY,
-                                  danger_color=DANGER_COLOR,
-                                  warning_color=WARNING_COLOR,
-                                  success_color=SUCCESS_COLOR,
-                                  info_color=INFO_COLOR)
+    page, _ = _render_page()
+    return page_assets.send_asset(page, request, Response)
+
+@app.route("/assets/<name>")
+def page_asset(name):
+    asset = _render_page()[1].get(name)
+    if asset is None:
+        abort(404)
+    return page_assets.send_asset(asset, request, Response, immutable=True)
+
+@app.route("/filter/stats")
+def filter_stats():
+    bloom = get_filter()
+    if bloom is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **bloom.stats()})
+
+@app.route("/cache/stats")
+def cache_stats():
+    cache = get_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **cache.stats()})
+
+@app.route("/memory/stats")
+def memory_stats():
+    # Memory of whichever worker answered; see process_memory.py for the whole pool
+    return jsonify(process_memory.memory_usage() or {"available": False})
+
+@app.route("/range/<prefix>")
+def hash_range(prefix):
+    # k-anonymity lookup: clients send 5 hex characters of the SHA-1, never the password
+    location = range_buckets.parse_prefix(prefix)
+    if location is None:
+        return jsonify({"error": "prefix must be 5 hexadecimal characters"}), 400
+    bucket = get_range_bucket(*location)
+    if bucket is None:
+        return jsonify({"error": "hash-prefix buckets have not been built"}), 503
+    body, etag = bucket
+    response = Response(body, mimetype="text/plain")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"public, max-age={RANGE_MAX_AGE}, immutable"
+    return response.make_conditional(request)
+
+@app.route("/metrics")
+def prometheus_metrics():
+    # Summed over every worker sharing PASSMIMI_METRICS_DIR; see metrics.py
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+def _admin_denied():
+    # An error response unless the request carries the admin token; without
+    # a configured token the admin routes do not exist
+    if not ADMIN_TOKEN:
+        abort(404)
+    supplied = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {ADMIN_TOKEN}".encode()):
+        return jsonify({"error": "admin token required"}), 401
+    return None
+
+@app.route("/admin/profile", methods=["GET", "POST"])
+def admin_profile():
+    # Changes only the worker that answers; the response names its pid
+    denied = _admin_denied()
+    if denied is not None:
+        return denied
+    if request.method == "POST":
+        rate = request.values.get("rate", type=float)
+        if rate is None or not 0 <= rate <= 1:
+            return jsonify({"error": "rate must be a number from 0 to 1"}), 400
+        profiler.set_rate(rate)
+    return jsonify(profiler.status())
+
+@app.route("/admin/banned")
+def admin_banned():
+    denied = _admin_denied()
+    if denied is not None:
+        return denied
+    return jsonify(banned_lists.status())
+
+@app.route("/admin/banned/<name>", methods=["PUT", "POST", "DELETE"])
+def admin_banned_list(name):
+    # PUT replaces the list with the body, one password per line, POST adds
+    # the lines to it and DELETE removes it. The answering worker reloads at
+    # once, the others within PASSMIMI_BANNED_RELOAD_INTERVAL.
+    denied = _admin_denied()
+    if denied is not None:
+        return denied
+    if not banned_lists.valid_name(name):
+        return jsonify({"error": "list names are letters, digits, '.', '_' and '-'"}), 400
+    if request.method == "DELETE":
+        if not banned_lists.delete_list(name):
+            return jsonify({"error": f"no banned list named {name}"}), 404
+    else:
+        banned_lists.write_list(name, request.get_data().splitlines(), append=request.method == "POST")
+    return jsonify(banned_lists.status())
 
 @app.route("/check", methods=["POST"])
 def check_password():
+    started = time.perf_counter()
     password = request.form.get("password", "")
-    time.sleep(1.5)  # Simulate processing time
-    result = evaluate_password(password)
-    
-    length = len(password)
-    has_upper = any(c.isupper() for c in password)
-    has_lower = any(c.islower() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    symbol_count = len(re.findall(r"[!@#$%^&*(),.?\":{}|<>]", password))
-    
-    if result.get("rating") == 1 and "wordlists" in result.get("remark", "").lower():
-        result["crack_time"] = "Instantly"
+    time.sleep(CHECK_DELAY)  # Simulate processing time
+    metrics.check_stage("delay", started)
+    session = profiler.maybe_start("check")
+    if session is None:
+        result = analyze_password_cached(password)
     else:
-        pool = 0
-        if has_lower: pool += 26
-        if has_upper: pool += 26
-        if has_digit: pool += 10
-        if symbol_count > 0: pool += 32
-        if pool == 0: pool = 26
-        combinations = pool ** length
-        seconds = combinations / 100_000_000_000
-        if length == 0 or seconds < 1: result["crack_time"] = "Instantly"
-        elif seconds < 60: result["crack_time"] = f"{int(seconds)} Secs"
-        elif seconds < 3600: result["crack_time"] = f"{int(seconds/60)} Mins"
-        elif seconds < 86400: result["crack_time"] = f"{int(seconds/3600)} Hours"
-        elif seconds < 31536000: result["crack_time"] = f"{int(seconds/86400)} Days"
-        elif seconds < 3153600000: result["crack_time"] = f"{int(seconds/31536000)} Yrs"
-        else: result["crack_time"] = "100+ Years"
-        
-    return jsonify(result)
+        try:
+            result = session.run(analyze_password_cached, password)
+        finally:
+            session.finish()
+    response = jsonify(add_base_word(result, password))
+    metrics.check_stage("total", started)
+    return response
+
+# Proxies such as nginx would otherwise hold the estimate back until the result
+EVENT_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@app.route("/check/stream", methods=["POST"])
+def check_password_stream():
+    # Server-sent events: the estimate at once, then the result no sooner
+    # than the /check delay, which overlaps the breach lookup
+    started = time.perf_counter()
+    password = request.form.get("password", "")
+    events = analyze_password_progressive(password)
+    session = profiler.maybe_start("check")
+    advance = (functools.partial(next, events, None) if session is None
+               else functools.partial(session.run, next, events, None))
+
+    def generate():
+        for event, result in iter(advance, None):
+            if event == "result":
+                remaining = CHECK_DELAY - (time.perf_counter() - started)
+                if remaining > 0:
+                    slept = time.perf_counter()
+                    time.sleep(remaining)
+                    metrics.check_stage("delay", slept)
+            else:
+                metrics.check_stage("first_event", started)
+            yield server_sent_event(event, result)
+        metrics.check_stage("total", started)
+    response = Response(generate(), mimetype="text/event-stream", headers=EVENT_STREAM_HEADERS)
+    if session is not None:
+        response.call_on_close(session.finish)
+    return response
+
+def _batch_items():
+    # NDJSON bodies are read line by line so the batch never sits in memory;
+    # a JSON array has to be parsed whole. None when the body is neither.
+    if request.mimetype in NDJSON_MIMETYPES:
+        return (item for item in map(parse_batch_line, request.stream) if item is not None)
+    items = request.get_json(force=True, silent=True)
+    return items if isinstance(items, list) else None
+
+@app.route("/check/batch", methods=["POST"])
+def check_password_batch():
+    # A bad body is rejected before the stream starts, while the status can still say so
+    batch = _batch_items()
+    if batch is None:
+        return jsonify({"error": "expected a JSON array or an NDJSON body"}), 400
+    session = profiler.maybe_start("batch")
+    analyze = analyze_batch_item if session is None else functools.partial(session.run, analyze_batch_item)
+
+    def generate():
+        pending = set()
+        items = enumerate(batch)
+        exhausted = False
+        while pending or not exhausted:
+            # Keep a bounded window in flight and emit results as they finish
+            while not exhausted and len(pending) < BATCH_MAX_IN_FLIGHT:
+                try:
+                    position, item = next(items)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    pending.add(_batch_executor.submit(analyze, position, item))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield json.dumps(future.result()) + "\n"
+    response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    if session is not None:
+        # Also runs when the client disconnects mid-stream
+        response.call_on_close(session.finish)
+    return response
 
 # ========================== MODERN HTML TEMPLATE ==========================
 TEMPLATE = '''
@@ -447,7 +433,7 @@ TEMPLATE = '''
                 
                 <div class="loading-container" id="loadingContainer">
                     <div class="spinner"></div>
-                    <div class="loading-text">Analyzing password security...</div>
+                    <div class="loading-text" id="loadingText">Analyzing password security...</div>
                 </div>
             </div>
         </div>
@@ -531,6 +517,7 @@ TEMPLATE = '''
             const togglePassword = document.getElementById('togglePassword');
             const analyzeBtn = document.getElementById('analyzeBtn');
             const loadingContainer = document.getElementById('loadingContainer');
+            const loadingText = document.getElementById('loadingText');
             const resultSection = document.getElementById('resultSection');
             const mainContainer = document.getElementById('mainContainer');
             const strengthCircle = document.getElementById('strengthCircle');
@@ -552,6 +539,94 @@ TEMPLATE = '''
                 togglePassword.innerHTML = type === 'password' ? '<i class="fas fa-eye"></i>' : '<i class="fas fa-eye-slash"></i>';
             });
             
+            function showResult(d) {
+                /* --- THIS IS THE JAVASCRIPT THAT TRIGGERS THE ANIMATION --- */
+                mainContainer.classList.add('with-result');
+                resultSection.classList.add('active');
+                /* --- END OF ANIMATION TRIGGER --- */
+
+                // Update detail values
+                document.getElementById('crackTimeValue').textContent = d.crack_time;
+                uppercaseValue.textContent = d.details.Uppercase ? 'Yes' : 'No';
+                uppercaseValue.style.color = d.details.Uppercase ? 'var(--success)' : 'var(--danger)';
+                
+                lowercaseValue.textContent = d.details.Lowercase ? 'Yes' : 'No';
+                lowercaseValue.style.color = d.details.Lowercase ? 'var(--success)' : 'var(--danger)';
+                
+                digitsValue.textContent = d.details.Digits ? 'Yes' : 'No';
+                digitsValue.style.color = d.details.Digits ? 'var(--success)' : 'var(--danger)';
+                
+                symbolsValue.textContent = d.details.Symbols;
+                symbolsValue.style.color = d.details.Symbols > 0 ? 'var(--success)' : 'var(--danger)';
+                
+                // Update strength display
+                strengthRating.textContent = d.rating;
+                strengthText.textContent = "/10";
+                strengthLabel.textContent = d.strength;
+                strengthDescription.textContent = d.remark;
+                strengthCircle.style.background = `conic-gradient(${d.circle_color} 0%, ${d.circle_color} ${d.rating * 10}%, var(--surface-light) ${d.rating * 10}%, var(--surface-light) 100%)`;
+                strengthCircle.classList.add('pulse');
+                
+                // Update remark and suggestion
+                // The remark can carry list names, so it goes in as text, never markup
+                remark.innerHTML = '<i class="fas fa-info-circle"></i> ';
+                remark.appendChild(document.createTextNode(d.remark));
+                suggestionText.textContent = d.suggestion;
+                
+                // Remove pulse animation after 3 seconds
+                setTimeout(() => {
+                    strengthCircle.classList.remove('pulse');
+                }, 3000);
+            }
+            
+            function finishLoading() {
+                // Hide loading and re-enable button
+                loadingContainer.style.display = 'none';
+                loadingText.textContent = 'Analyzing password security...';
+                analyzeBtn.disabled = false;
+                analyzeBtn.innerHTML = '<i class="fas fa-search"></i> Analyze Password';
+            }
+            
+            // One server-sent event: "estimate" comes first without the breach
+            // lists, "result" is final; each redraws the same display
+            function handleEvent(block) {
+                let event = 'message', data = '';
+                block.split('\\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                });
+                if (!data) return false;
+                showResult(JSON.parse(data));
+                if (event === 'result') {
+                    finishLoading();
+                    return true;
+                }
+                loadingText.textContent = 'Checking breach lists...';
+                return false;
+            }
+            
+            function readEvents(response) {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                // Without streaming support both events are handled when the body completes
+                if (!response.body || !response.body.getReader) {
+                    return response.text().then(text => text.split('\\n\\n').some(handleEvent));
+                }
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                function pump() {
+                    return reader.read().then(({done, value}) => {
+                        buffer += decoder.decode(value || new Uint8Array(), {stream: !done});
+                        const blocks = buffer.split('\\n\\n');
+                        buffer = blocks.pop();
+                        if (blocks.some(handleEvent)) return true;
+                        if (done) return handleEvent(buffer);
+                        return pump();
+                    });
+                }
+                return pump();
+            }
+            
             // Analyze password
             analyzeBtn.addEventListener('click', function() {
                 const password = passwordInput.value;
@@ -566,62 +641,21 @@ TEMPLATE = '''
                 analyzeBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Analyzing...';
                 loadingContainer.style.display = 'flex';
                 
-                // Send request to server
-                fetch("/check", {
+                // Send request to server; the display updates as each event arrives
+                fetch("/check/stream", {
                     method: "POST", 
                     headers: {
                         'Content-Type': 'application/x-www-form-urlencoded',
                     },
                     body: new URLSearchParams({password: password})
                 })
-                .then(r => r.json())
-                .then(d => {
-                    // Hide loading and re-enable button
-                    loadingContainer.style.display = 'none';
-                    analyzeBtn.disabled = false;
-                    analyzeBtn.innerHTML = '<i class="fas fa-search"></i> Analyze Password';
-                    
-                    /* --- THIS IS THE JAVASCRIPT THAT TRIGGERS THE ANIMATION --- */
-                    mainContainer.classList.add('with-result');
-                    resultSection.classList.add('active');
-                    /* --- END OF ANIMATION TRIGGER --- */
-
-                    // Update detail values
-                    document.getElementById('crackTimeValue').textContent = d.crack_time;
-                    uppercaseValue.textContent = d.details.Uppercase ? 'Yes' : 'No';
-                    uppercaseValue.style.color = d.details.Uppercase ? 'var(--success)' : 'var(--danger)';
-                    
-                    lowercaseValue.textContent = d.details.Lowercase ? 'Yes' : 'No';
-                    lowercaseValue.style.color = d.details.Lowercase ? 'var(--success)' : 'var(--danger)';
-                    
-                    digitsValue.textContent = d.details.Digits ? 'Yes' : 'No';
-                    digitsValue.style.color = d.details.Digits ? 'var(--success)' : 'var(--danger)';
-                    
-                    symbolsValue.textContent = d.details.Symbols;
-                    symbolsValue.style.color = d.details.Symbols > 0 ? 'var(--success)' : 'var(--danger)';
-                    
-                    // Update strength display
-                    strengthRating.textContent = d.rating;
-                    strengthText.textContent = "/10";
-                    strengthLabel.textContent = d.strength;
-                    strengthDescription.textContent = d.remark;
-                    strengthCircle.style.background = `conic-gradient(${d.circle_color} 0%, ${d.circle_color} ${d.rating * 10}%, var(--surface-light) ${d.rating * 10}%, var(--surface-light) 100%)`;
-                    strengthCircle.classList.add('pulse');
-                    
-                    // Update remark and suggestion
-                    remark.innerHTML = `<i class="fas fa-info-circle"></i> ${d.remark}`;
-                    suggestionText.textContent = d.suggestion;
-                    
-                    // Remove pulse animation after 3 seconds
-                    setTimeout(() => {
-                        strengthCircle.classList.remove('pulse');
-                    }, 3000);
+                .then(readEvents)
+                .then(finished => {
+                    if (!finished) throw new Error('stream ended before the result');
                 })
                 .catch(error => {
                     // Hide loading and re-enable button on error
-                    loadingContainer.style.display = 'none';
-                    analyzeBtn.disabled = false;
-                    analyzeBtn.innerHTML = '<i class="fas fa-search"></i> Analyze Password';
+                    finishLoading();
                     remark.innerHTML = '<i class="fas fa-exclamation-triangle"></i> Error analyzing password';
                     console.error('Error:', error);
                 });
@@ -642,6 +676,8 @@ TEMPLATE = '''
 '''
 
 def start_webview():
+    # Imported here so headless servers never load a GUI toolkit
+    import webview
     webview.create_window('PassMimi Software', app, width=1200, height=800, icon=os.path.join(basedir, "static", "favicon.ico"))
     webview.start()
 
@@ -0,0 +1,209 @@
+import asyncio, functools, json, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from config import ASGI_WORKERS, ASGI_MAX_IN_FLIGHT, BATCH_MAX_IN_FLIGHT, CHECK_DELAY
+from evaluation import (
+    NDJSON_MIMETYPES, add_base_word, analyze_batch_item, analyze_password_cached, analyze_password_progressive,
+    parse_batch_line, server_sent_event,
+)
+from app import EVENT_STREAM_HEADERS, app as flask_app
+import metrics, profiler
+
+# ========================== ASGI SERVING ==========================
+# Async front for the same routes:  uvicorn asgi:application
+# /check, /check/stream and /check/batch are handled natively. The delay is an asyncio sleep
+# and evaluations run on a bounded thread pool, so a waiting check costs a
+# coroutine instead of a whole worker. Every other route (the page, static
+# files, /filter/stats) goes to the Flask app unchanged.
+_executor = ThreadPoolExecutor(ASGI_WORKERS, thread_name_prefix="passmimi-asgi")
+_flask = WsgiToAsgi(flask_app)
+_in_flight = None
+
+
+def _limiter():
+    # Created lazily so it binds to the server's event loop
+    global _in_flight
+    if _in_flight is None:
+        _in_flight = asyncio.Semaphore(ASGI_MAX_IN_FLIGHT)
+    return _in_flight
+
+
+def _mimetype(scope):
+    for name, value in scope["headers"]:
+        if name == b"content-type":
+            return value.decode("latin-1").split(";")[0].strip().lower()
+    return ""
+
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _iter_body_lines(receive):
+    carry = b""
+    while True:
+        message = await receive()
+        lines = (carry + message.get("body", b"")).split(b"\n")
+        carry = lines.pop()
+        for line in lines:
+            yield line
+        if not message.get("more_body"):
+            break
+    if carry:
+        yield carry
+
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({"type": "http.response.start", "status": status, "headers": [
+        (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def check_password(scope, receive, send):
+    started = time.perf_counter()
+    password = await _read_password(receive)
+    async with _limiter():
+        await asyncio.sleep(CHECK_DELAY)  # Simulate processing time
+        metrics.check_stage("delay", started)
+        session = profiler.maybe_start("check")
+        if session is None:
+            result = await _run(analyze_password_cached, password)
+        else:
+            try:
+                result = await _run(session.run, analyze_password_cached, password)
+            finally:
+                session.finish()
+    await _send_json(send, 200, add_base_word(result, password))
+    metrics.check_stage("total", started)
+
+
+async def _read_password(receive):
+    form = parse_qs((await _read_body(receive)).decode("utf-8", errors="replace"), keep_blank_values=True)
+    return form.get("password", [""])[0]
+
+
+async def check_password_stream(scope, receive, send):
+    # Server-sent events: the estimate at once, then the result no sooner
+    # than the /check delay, which overlaps the breach lookup
+    started = time.perf_counter()
+    password = await _read_password(receive)
+    headers = [(b"content-type", b"text/event-stream")]
+    headers += [(name.lower().encode(), value.encode()) for name, value in EVENT_STREAM_HEADERS.items()]
+    async with _limiter():
+        events = analyze_password_progressive(password)
+        session = profiler.maybe_start("check")
+        advance = (functools.partial(next, events, None) if session is None
+                   else functools.partial(session.run, next, events, None))
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            while (item := await _run(advance)) is not None:
+                event, result = item
+                if event == "result":
+                    remaining = CHECK_DELAY - (time.perf_counter() - started)
+                    if remaining > 0:
+                        slept = time.perf_counter()
+                        await asyncio.sleep(remaining)
+                        metrics.check_stage("delay", slept)
+                else:
+                    metrics.check_stage("first_event", started)
+                await send({"type": "http.response.body", "body": server_sent_event(event, result).encode(),
+                            "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            if session is not None:
+                session.finish()
+    metrics.check_stage("total", started)
+
+
+async def _batch_items(scope, receive):
+    # An async iterator over the items, or None when the body is neither
+    # NDJSON nor a JSON array
+    if _mimetype(scope) in NDJSON_MIMETYPES:
+        return _iter_ndjson_items(receive)
+    try:
+        items = json.loads(await _read_body(receive))
+    except ValueError:
+        return None
+    return _iter_items(items) if isinstance(items, list) else None
+
+
+async def _iter_ndjson_items(receive):
+    async for line in _iter_body_lines(receive):
+        item = parse_batch_line(line)
+        if item is not None:
+            yield item
+
+
+async def _iter_items(items):
+    for item in items:
+        yield item
+
+
+async def check_password_batch(scope, receive, send):
+    # A bad body is rejected before the stream starts, while the status can still say so
+    items = await _batch_items(scope, receive)
+    if items is None:
+        return await _send_json(send, 400, {"error": "expected a JSON array or an NDJSON body"})
+    session = profiler.maybe_start("batch")
+    analyze = analyze_batch_item if session is None else functools.partial(session.run, analyze_batch_item)
+    try:
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]})
+        loop = asyncio.get_running_loop()
+        pending, position, exhausted = set(), 0, False
+        while pending or not exhausted:
+            # Keep a bounded window in flight and emit results as they finish
+            while not exhausted and len(pending) < BATCH_MAX_IN_FLIGHT:
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.add(loop.run_in_executor(_executor, analyze, position, item))
+                    position += 1
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            body = "".join(json.dumps(future.result()) + "\n" for future in done).encode()
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        if session is not None:
+            session.finish()
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _executor.shutdown(wait=False, cancel_futures=True)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] == "http" and scope["method"] == "POST":
+        if scope["path"] == "/check" and _mimetype(scope) == "application/x-www-form-urlencoded":
+            return await check_password(scope, receive, send)
+        if scope["path"] == "/check/stream" and _mimetype(scope) == "application/x-www-form-urlencoded":
+            return await check_password_stream(scope, receive, send)
+        if scope["path"] == "/check/batch":
+            return await check_password_batch(scope, receive, send)
+    return await _flask(scope, receive, send)
@@ -0,0 +1,193 @@
+import os, re, tempfile, threading, time
+
+from config import BANNED_DIR, BANNED_RELOAD_INTERVAL
+import metrics, wordlist_index
+
+# ========================== CUSTOM BANNED LISTS ==========================
+# Organization-specific lists kept apart from the public breach lists: every
+# file in BANNED_DIR is one list, named after the file ("phished.txt" ->
+# "phished"; .gz, .xz and .zst are read too). They are small and change
+# daily, so instead of going through the on-disk index they are compiled into
+# two dicts, one of exact digests and one of normalized forms ("Acme2024!" ->
+# "acme"), each mapping to the names of the lists holding it.
+#
+# Each process compares the directory listing (name, size, mtime, inode) at
+# most every BANNED_RELOAD_INTERVAL seconds. On a change, one thread compiles
+# the new lists while the others keep answering from the old ones. The new
+# BannedLists object then replaces the old one in a single assignment, so a
+# request already holding the old object finishes with it. Writes from the
+# admin API replace files with a rename, so a reader never sees half a list.
+_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+
+class BannedLists:
+    def __init__(self, signature=(), exact=None, normalized=None, lists=None, reload_seconds=0.0):
+        self.signature = signature
+        self.exact = exact or {}
+        self.normalized = normalized or {}
+        self.lists = lists or {}  # name -> entries
+        self.loaded = time.time()
+        self.reload_seconds = reload_seconds
+
+    def lookup(self, password):
+        # (list names, "exact" or "variant"), or None
+        for key in wordlist_index.password_keys(password):
+            names = self.exact.get(key)
+            if names:
+                return list(names), "exact"
+        if self.normalized:
+            for base in wordlist_index.normalized_forms(password):
+                names = self.normalized.get(wordlist_index.password_digest(base))
+                if names:
+                    return list(names), "variant"
+        return None
+
+
+def list_name(file_path):
+    name = os.path.basename(wordlist_index.strip_codec_suffix(file_path))
+    return name[:-4] if name.endswith(".txt") else name
+
+
+def _signature(directory):
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except OSError:
+        return ()
+    return tuple((entry.name, st.st_size, st.st_mtime_ns, st.st_ino)
+                 for entry in entries if entry.is_file() and not entry.name.startswith(".")
+                 for st in (entry.stat(),))
+
+
+def compile_lists(directory, signature):
+    started = time.perf_counter()
+    exact, normalized, lists = {}, {}, {}
+    for file_name, *_ in signature:
+        file_path = os.path.join(directory, file_name)
+        name = list_name(file_path)
+        if not valid_name(name):
+            # Names end up in remarks and the admin API; only ones it could have written are used
+            print(f"[WARN] Skipping banned list with an invalid name: {file_path!r}")
+            continue
+        count = 0
+        try:
+            for line in wordlist_index.iter_lines(file_path):
+                count += 1
+                names = exact.setdefault(wordlist_index.password_digest(line), [])
+                if name not in names:
+                    names.append(name)
+                base = wordlist_index.normalize_line(line)
+                if base is not None:
+                    names = normalized.setdefault(wordlist_index.password_digest(base), [])
+                    if name not in names:
+                        names.append(name)
+        except OSError as e:
+            # Deleted or replaced while listing; the next check sees the new listing
+            print(f"[WARN] Could not read banned list {file_path}: {e}")
+            continue
+        lists[name] = lists.get(name, 0) + count
+    # Lists of names are shared between entries, so a million entries on the
+    # same list hold one tuple
+    interned = {}
+    exact = {key: interned.setdefault(tuple(names), tuple(names)) for key, names in exact.items()}
+    normalized = {key: interned.setdefault(tuple(names), tuple(names)) for key, names in normalized.items()}
+    return BannedLists(signature, exact, normalized, lists, time.perf_counter() - started)
+
+
+# ========================== LOADING ==========================
+_current = BannedLists()
+_checked = None
+_lock = threading.Lock()
+
+
+def get_banned(directory=BANNED_DIR):
+    now = time.monotonic()
+    if _checked is not None and now - _checked < BANNED_RELOAD_INTERVAL:
+        return _current
+    # Whoever holds the lock is already reloading; everyone else keeps the current lists
+    if not _lock.acquire(blocking=_checked is None):
+        return _current
+    try:
+        return _reload(directory)
+    finally:
+        _lock.release()
+
+
+def reload(directory=BANNED_DIR):
+    with _lock:
+        return _reload(directory)
+
+
+def _reload(directory):
+    global _current, _checked
+    signature = _signature(directory)
+    if signature != _current.signature:
+        started = time.perf_counter()
+        _current = compile_lists(directory, signature)
+        metrics.banned_reload(started)
+    _checked = time.monotonic()
+    return _current
+
+
+def status(directory=BANNED_DIR):
+    banned = get_banned(directory)
+    return {"pid": os.getpid(), "directory": directory, "lists": banned.lists,
+            "entries": len(banned.exact), "loaded": banned.loaded,
+            "reload_seconds": round(banned.reload_seconds, 6)}
+
+
+# ========================== EDITING ==========================
+def valid_name(name):
+    return _NAME.match(name) is not None and not name.endswith(".tmp")
+
+
+def _list_path(directory, name):
+    return os.path.join(directory, f"{name}.txt")
+
+
+def write_list(name, lines, append=False, directory=BANNED_DIR):
+    # Replaces (or extends) list `name` with a rename and reloads this process;
+    # other workers pick the file up within BANNED_RELOAD_INTERVAL
+    os.makedirs(directory, exist_ok=True)
+    path = _list_path(directory, name)
+    entries = {}
+    if append and os.path.exists(path):
+        entries = dict.fromkeys(wordlist_index.iter_lines(path))
+    entries.update(dict.fromkeys(line for line in lines if line))
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(line + b"\n" for line in entries)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    reload(directory)
+    return len(entries)
+
+
+def delete_list(name, directory=BANNED_DIR):
+    # Removes every file the loader reads as list `name`, whatever its suffix
+    deleted = False
+    for file_name, *_ in _signature(directory):
+        path = os.path.join(directory, file_name)
+        if list_name(path) != name:
+            continue
+        try:
+            os.unlink(path)
+            deleted = True
+        except FileNotFoundError:
+            pass
+    if not deleted:
+        return False
+    reload(directory)
+    return True
+
+
+def _after_fork():
+    # A lock held by a reloading thread would never be released in the child
+    global _lock
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,110 @@
+import argparse, gzip, json, lzma, os, random, shutil, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wordlist_index, wordlist_scan
+
+# ========================== CODEC BENCHMARK ==========================
+# Disk versus CPU for shipping wordlists compressed. For each codec: size on
+# disk, a full cold scan (a password that is not in the list) and an index
+# build from the compressed file. Lookups are then identical for every codec,
+# since the built index does not depend on how its sources were stored.
+
+
+def synthetic_wordlist(path, lines, seed=1):
+    # Words with the usual suffixes and capitalisation, so the text compresses
+    # roughly like a real leak rather than like random bytes
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ne", "ra", "to", "su", "an", "el", "or", "ch", "st", "ia", "be", "ly"]
+    words = ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(20000)]
+    suffixes = ["", "", "1", "12", "123", "!", "01", "2020", "1999", "69", "007", "@"]
+    with open(path, "w", encoding="ascii", newline="\n") as f:
+        for _ in range(lines):
+            word = rng.choice(words)
+            if rng.random() < 0.3:
+                word = word.capitalize()
+            f.write(word + rng.choice(suffixes) + (str(rng.randint(0, 9999)) if rng.random() < 0.3 else "") + "\n")
+
+
+def compress(source, codec, level):
+    target = source + codec
+    started = time.perf_counter()
+    if codec == ".gz":
+        with open(source, "rb") as src, gzip.open(target, "wb", compresslevel=level or 6) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    elif codec == ".xz":
+        with open(source, "rb") as src, lzma.open(target, "wb", preset=level or 6) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    elif codec == ".zst":
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            wordlist_index.zstandard.ZstdCompressor(level=level or 19, threads=-1).copy_stream(src, dst)
+    return target, time.perf_counter() - started
+
+
+def measure(file_path, workdir):
+    started = time.perf_counter()
+    wordlist_scan.scan_file(file_path, [b"not-in-the-list-\x01"])
+    scan_s = time.perf_counter() - started
+    started = time.perf_counter()
+    wordlist_index.build_index([file_path], os.path.join(workdir, "bench.idx"),
+                               manifest_path=os.path.join(workdir, "bench.json"))
+    build_s = time.perf_counter() - started
+    return scan_s, build_s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare wordlist codecs: disk size against scan and index-build time.")
+    parser.add_argument("--input", help="wordlist to benchmark (default: a synthetic one)")
+    parser.add_argument("--lines", type=int, default=2_000_000, help="lines in the synthetic wordlist")
+    parser.add_argument("--level", type=int, help="compression level for every codec (default: codec-specific)")
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    codecs = ["", ".gz", ".xz"] + ([".zst"] if wordlist_index.zstandard is not None else [])
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        plain = os.path.join(workdir, "wordlist.txt")
+        if args.input:
+            shutil.copyfile(args.input, plain)
+        else:
+            synthetic_wordlist(plain, args.lines)
+        plain_size = os.path.getsize(plain)
+        for codec in codecs:
+            file_path, compress_s = compress(plain, codec, args.level) if codec else (plain, 0.0)
+            scan_s, build_s = measure(file_path, workdir)
+            size = os.path.getsize(file_path)
+            results.append({
+                "codec": codec.lstrip(".") or "none",
+                "bytes": size,
+                "ratio": round(plain_size / size, 2),
+                "compress_s": round(compress_s, 3),
+                "scan_s": round(scan_s, 3),
+                "scan_mb_per_s": round(plain_size / 2**20 / scan_s, 1),
+                "index_build_s": round(build_s, 3),
+            })
+
+        index = wordlist_index.open_index(os.path.join(workdir, "bench.idx"))
+        with open(plain, "rb") as f:
+            samples = [line.rstrip(b"\n").decode() for _, line in zip(range(args.lookups), f)]
+        started = time.perf_counter()
+        for password in samples:
+            index.contains_password(password)
+        lookup_us = (time.perf_counter() - started) / len(samples) * 1e6
+        index.close()
+
+    if args.json:
+        print(json.dumps({"plain_bytes": plain_size, "lookup_us": round(lookup_us, 2), "codecs": results}, indent=2))
+        return 0
+    print(f"{'codec':<6} {'MiB':>8} {'ratio':>6} {'compress s':>11} {'scan s':>8} {'scan MB/s':>10} {'build s':>8}")
+    for r in results:
+        print(f"{r['codec']:<6} {r['bytes'] / 2**20:>8.1f} {r['ratio']:>6} {r['compress_s']:>11} "
+              f"{r['scan_s']:>8} {r['scan_mb_per_s']:>10} {r['index_build_s']:>8}")
+    print(f"[INFO] Index lookup after building: {lookup_us:.2f} us per password, whatever the codec")
+    if wordlist_index.zstandard is None:
+        print("[INFO] zstandard is not installed; .zst was skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import argparse, os, sys, timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crack_time import estimate_all, estimate_crack_time
+from features import PasswordFeatures
+
+# ========================== CRACK-TIME MICRO-BENCHMARK ==========================
+# Compares the log-space estimator (one profile and all profiles) against the
+# original big-integer pool ** length computation for growing password
+# lengths. The log-space columns should stay flat; the big-integer one grows
+# with length.
+
+
+def bigint_estimate(features):
+    pool = 0
+    if features.has_lower: pool += 26
+    if features.has_upper: pool += 26
+    if features.has_digit: pool += 10
+    if features.symbol_count > 0: pool += 32
+    if pool == 0: pool = 26
+    combinations = pool ** features.length
+    # The original float division overflows past ~150 characters
+    return combinations // 100_000_000_000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the crack-time estimator.")
+    parser.add_argument("--lengths", type=int, nargs="*", default=[8, 16, 64, 256, 1024, 4096])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(f"{'length':>8}  {'one profile (us)':>17}  {'all profiles (us)':>18}  {'big-int (us)':>13}")
+    for length in args.lengths:
+        features = PasswordFeatures(("aB3!" * length)[:length])
+        one_us = timeit.timeit(lambda: estimate_crack_time(features), number=args.number) / args.number * 1e6
+        all_us = timeit.timeit(lambda: estimate_all(features), number=args.number) / args.number * 1e6
+        big_us = timeit.timeit(lambda: bigint_estimate(features), number=args.number) / args.number * 1e6
+        print(f"{length:>8}  {one_us:>17.2f}  {all_us:>18.2f}  {big_us:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
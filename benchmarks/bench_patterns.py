@@ -0,0 +1,68 @@
+import argparse, json, math, os, random, string, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import patterns
+from crack_time import log10_pool
+from features import PasswordFeatures
+
+# ========================== PATTERN MATCHER BENCHMARK ==========================
+# Per-password cost of the structural matchers and the minimum-guess DP on a
+# mixed corpus: random strings, keyboard walks, sequences, repeats, dates and
+# word-plus-suffix passwords. Fails when the mean exceeds the budget, so the
+# batch and audit paths keep their throughput.
+
+
+def synthetic_corpus(count, seed=1):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "!@#$%&*"
+    walks = ["qwerty", "asdfgh", "zxcvbn", "1qaz2wsx", "qazwsx", "poiuyt", "7894561", "!QAZ@WSX"]
+    words = ["summer", "dragon", "monkey", "shadow", "master", "sunshine", "football", "princess"]
+    makers = (
+        lambda: "".join(rng.choices(alphabet, k=rng.randint(8, 20))),
+        lambda: rng.choice(walks).capitalize() + str(rng.randint(0, 9999)) + rng.choice("!@#") * rng.randint(1, 4),
+        lambda: "".join(chr(ord("a") + (rng.randint(0, 20) + i) % 26) for i in range(rng.randint(3, 8))) + "123",
+        lambda: rng.choice(words).capitalize() + str(rng.randint(1950, 2030)) + "!",
+        lambda: f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(1950, 2030)}",
+        lambda: rng.choice(words) * rng.randint(2, 3),
+    )
+    return [rng.choice(makers)() for _ in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the structural pattern matchers.")
+    parser.add_argument("-n", "--passwords", type=int, default=20000)
+    parser.add_argument("--budget-us", type=float, default=50.0, help="maximum mean microseconds per password")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = synthetic_corpus(args.passwords)
+    pools = [log10_pool(PasswordFeatures(password)) for password in corpus]
+    timings = []
+    for password, pool in zip(corpus, pools):
+        started = time.perf_counter()
+        patterns.minimum_guesses(password, pool)
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    mean = math.fsum(timings) / len(timings)
+    results = {
+        "passwords": len(timings),
+        "mean_us": round(mean, 2),
+        "p50_us": round(timings[len(timings) // 2], 2),
+        "p99_us": round(timings[int(len(timings) * 0.99)], 2),
+        "passwords_per_second": round(1e6 / mean),
+        "budget_us": args.budget_us,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['passwords']} passwords: mean {results['mean_us']} us, p50 {results['p50_us']} us, "
+              f"p99 {results['p99_us']} us ({results['passwords_per_second']}/s per core)")
+    if mean > args.budget_us:
+        print(f"[FAIL] mean {mean:.1f} us > budget {args.budget_us} us")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import argparse, json, os, statistics, subprocess, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+# ========================== STARTUP BENCHMARK ==========================
+# Cold-starts a fresh interpreter, imports the headless entry point and
+# serves one /check through the Flask test client. Times are wall-clock from
+# process spawn. The run fails when the median exceeds the budget tracked in
+# startup_budget.json, or when a GUI or batch-only module was imported.
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import server
+imported = time.perf_counter()
+response = server.app.test_client().post("/check", data={"password": "Password123!"})
+checked = time.perf_counter()
+print(json.dumps({"status": response.status_code, "import_s": imported - started,
+                  "check_s": checked - imported, "modules": sorted(sys.modules)}))
+"""
+
+
+def run_once():
+    env = dict(os.environ, PASSMIMI_CHECK_DELAY="0")
+    spawned = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _CHILD], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    finished = time.perf_counter()
+    child = json.loads(out.stdout.strip().splitlines()[-1])
+    # Interpreter start-up is whatever the child did not account for itself
+    interpreter_s = (finished - spawned) - child["import_s"] - child["check_s"]
+    return {
+        "status": child["status"],
+        "import_server_ms": (interpreter_s + child["import_s"]) * 1000,
+        "first_check_ms": (finished - spawned) * 1000,
+        "modules": child["modules"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure headless cold start against the tracked budget.")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    with open(BUDGET_PATH, "r", encoding="utf-8") as f:
+        budget = json.load(f)
+    runs = [run_once() for _ in range(args.runs)]
+    results = {
+        "import_server_ms": round(statistics.median(r["import_server_ms"] for r in runs), 1),
+        "first_check_ms": round(statistics.median(r["first_check_ms"] for r in runs), 1),
+        "status": runs[-1]["status"],
+        "loaded_forbidden_modules": [m for m in budget["forbidden_modules"] if m in runs[-1]["modules"]],
+    }
+    failures = [f"{key} {results[key]} ms > {budget[key]} ms"
+                for key in ("import_server_ms", "first_check_ms") if results[key] > budget[key]]
+    if results["status"] != 200:
+        failures.append(f"/check returned {results['status']}")
+    if results["loaded_forbidden_modules"]:
+        failures.append(f"imported {', '.join(results['loaded_forbidden_modules'])} at startup")
+    results["failures"] = failures
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"import server: {results['import_server_ms']} ms (budget {budget['import_server_ms']} ms)")
+        print(f"first /check:  {results['first_check_ms']} ms (budget {budget['first_check_ms']} ms)")
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+import argparse, asyncio, http.client, importlib.util, json, os, platform, random, socket, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import generate, parse_size
+from load_test import run_load
+import process_memory
+
+# ========================== BENCHMARK SUITE ==========================
+# End-to-end numbers on a synthetic corpus, as one JSON document that can be
+# diffed across commits:
+#
+#   python benchmarks/bench_suite.py run --size 1GB --out before.json
+#   python benchmarks/bench_suite.py run --size 1GB --out after.json
+#   python benchmarks/bench_suite.py compare before.json after.json
+#
+# The corpus (see corpus.py) is generated once per size and seed and reused,
+# so runs on the same machine compare like for like. Every phase runs in its
+# own process: index and filter builds through their CLIs, lookups and the
+# audit in a child interpreter, and the server under gunicorn. Peak RSS is
+# measured per phase, including any worker processes it forked. The server
+# runs with PASSMIMI_CHECK_DELAY=0 and the result cache off, so the load
+# measures the pipeline rather than the cache.
+SCHEMA_VERSION = 1
+
+_LOOKUP_CHILD = """
+import json, sys, time
+import evaluation, wordlist_scan
+
+def percentiles(fn, passwords):
+    for password in passwords[:50]:
+        fn(password)
+    times = []
+    for password in passwords:
+        started = time.perf_counter()
+        fn(password)
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return {"p50_us": round(times[len(times) // 2] * 1e6, 1),
+            "p99_us": round(times[min(len(times) - 1, int(len(times) * 0.99))] * 1e6, 1)}
+
+spec = json.loads(sys.stdin.read())
+present, absent = spec["present"], spec["absent"]
+results = {
+    "wordlist_present": percentiles(evaluation.check_in_wordlists, present),
+    "wordlist_absent": percentiles(evaluation.check_in_wordlists, absent),
+    "analyze_present": percentiles(evaluation.analyze_password, present),
+    "analyze_absent": percentiles(evaluation.analyze_password, absent),
+}
+scans = []
+for password in (present + absent)[::max(1, len(present + absent) // max(1, spec["scans"]))][:spec["scans"]]:
+    started = time.perf_counter()
+    wordlist_scan.scan_wordlists(password, spec["sources"])
+    scans.append(time.perf_counter() - started)
+if scans:
+    results["scan_seconds"] = round(sum(scans) / len(scans), 3)
+print(json.dumps(results))
+"""
+
+
+# ========================== PHASES ==========================
+def _run_measured(args, env, stdin=None):
+    # (seconds, peak RSS bytes of the process and its children, stdout)
+    # Reaped with wait4 rather than Popen.wait, which would discard the usage;
+    # the usage of a reaped child includes the children it reaped itself
+    started = time.perf_counter()
+    proc = subprocess.Popen(args, cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    with proc.stdin:
+        proc.stdin.write(stdin or b"")
+    with proc.stdout:
+        out = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - started
+    if proc.returncode:
+        raise RuntimeError(f"{' '.join(args)} exited with {proc.returncode}")
+    # ru_maxrss is in KiB on Linux
+    return elapsed, usage.ru_maxrss * 1024, out
+
+
+def build_phase(manifest, index_dir, env):
+    os.makedirs(index_dir, exist_ok=True)
+    sources = manifest["sources"]
+    steps = {
+        "index": ["wordlist_index.py", "build", *sources, "--out", os.path.join(index_dir, "breach.idx"),
+                  "--manifest", os.path.join(index_dir, "breach.manifest.json")],
+        "normalized_index": ["wordlist_index.py", "build-normalized", *sources,
+                             "--out", os.path.join(index_dir, "breach.normalized.idx")],
+        "bloom_filter": ["breach_filter.py", *sources, "--index", os.path.join(index_dir, "breach.idx"),
+                         "--out", os.path.join(index_dir, "breach.bloom")],
+    }
+    results = {}
+    for name, args in steps.items():
+        print(f"[INFO] Building {name}", file=sys.stderr)
+        seconds, rss, _ = _run_measured([sys.executable, *args], env)
+        results[name] = {"seconds": round(seconds, 2), "peak_rss_bytes": rss}
+    return results
+
+
+def lookup_phase(manifest, env, scans):
+    spec = {"present": manifest["present"], "absent": manifest["absent"],
+            "sources": manifest["sources"], "scans": scans}
+    _, rss, out = _run_measured([sys.executable, "-c", _LOOKUP_CHILD], env, json.dumps(spec).encode())
+    results = json.loads(out.decode().strip().splitlines()[-1])
+    results["peak_rss_bytes"] = rss
+    return results
+
+
+def audit_passwords(manifest, count, seed):
+    # Mostly unbreached passwords, as in a real credential dump, plus every known hit
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%"
+    passwords = list(manifest["present"])
+    while len(passwords) < count:
+        passwords.append("".join(rng.choices(alphabet, k=rng.randint(6, 16))))
+    rng.shuffle(passwords)
+    return passwords[:count]
+
+
+def audit_phase(manifest, env, count, workers, work_dir):
+    input_path = os.path.join(work_dir, "audit.txt")
+    summary_path = os.path.join(work_dir, "audit-summary.json")
+    with open(input_path, "w", encoding="utf-8") as f:
+        f.writelines(password + "\n" for password in audit_passwords(manifest, count, manifest["seed"]))
+    args = [sys.executable, "passmimi.py", "audit", input_path, "-o", os.devnull, "--summary", summary_path]
+    if workers:
+        args += ["-j", str(workers)]
+    _, rss, _ = _run_measured(args, env)
+    with open(summary_path, "r", encoding="utf-8") as f:
+        summary = json.load(f)
+    return {"passwords": summary["total"], "breached": summary["breached"], "seconds": summary["seconds"],
+            "passwords_per_minute": summary["passwords_per_minute"], "peak_rss_bytes": rss}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port, proc, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not listen on port {port} within {timeout}s")
+
+
+def _peak_rss(pid):
+    # VmHWM: the high-water mark of a live process's resident set
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def batch_throughput(port, passwords):
+    body = "".join(json.dumps({"password": password, "id": i}) + "\n" for i, password in enumerate(passwords))
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+    started = time.perf_counter()
+    try:
+        conn.request("POST", "/check/batch", body.encode(), {"Content-Type": "application/x-ndjson"})
+        response = conn.getresponse()
+        results = sum(1 for line in response if line.strip())
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+    return {"items": results, "seconds": round(elapsed, 3), "items_per_second": round(results / elapsed, 1)}
+
+
+def server_phase(manifest, env, workers, requests, concurrency, batch_items, work_dir):
+    if importlib.util.find_spec("gunicorn") is None:
+        return {"skipped": "gunicorn is not installed"}
+    port = _free_port()
+    env = dict(env, PORT=str(port), PASSMIMI_CHECK_DELAY="0", PASSMIMI_CACHE_SIZE="0",
+               PASSMIMI_METRICS_DIR=os.path.join(work_dir, "metrics"))
+    if workers:
+        env["PASSMIMI_WEB_WORKERS"] = str(workers)
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "server:app"],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_for_port(port, proc)
+        passwords = audit_passwords(manifest, max(requests, batch_items), manifest["seed"] + 1)
+        url = f"http://127.0.0.1:{port}"
+        asyncio.run(run_load(url, min(requests, 200), concurrency, passwords))  # warm up every worker
+        load = asyncio.run(run_load(url, requests, concurrency, passwords))
+        pool = process_memory.pool_report(proc.pid)
+        results = {
+            "workers": len(pool) - 1,
+            "check": {key: load[key] for key in ("requests", "concurrency", "errors", "requests_per_second",
+                                                 "p50_ms", "p99_ms")},
+            "batch": batch_throughput(port, passwords[:batch_items]),
+            "memory": {"total_pss_bytes": sum(usage["pss"] for usage in pool),
+                       "peak_rss_bytes": sum(_peak_rss(usage["pid"]) or 0 for usage in pool)},
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    return results
+
+
+# ========================== RESULTS ==========================
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() + ("-dirty" if dirty else "")
+
+
+def run(args):
+    corpus_dir = args.corpus or os.path.join(tempfile.gettempdir(), f"passmimi-corpus-{args.size}-{args.seed}")
+    print(f"[INFO] Corpus in {corpus_dir}", file=sys.stderr)
+    manifest = generate(corpus_dir, args.size, args.seed)
+    index_dir = os.path.join(corpus_dir, "index")
+    env = dict(os.environ, PASSMIMI_INDEX_DIR=index_dir)
+    # Variables that would point phases somewhere other than the corpus index
+    for name in ("PASSMIMI_BLOOM_PATH", "PASSMIMI_RANGE_DIR", "PASSMIMI_CACHE_PATH"):
+        env.pop(name, None)
+
+    results = {}
+    if args.reuse_index and os.path.exists(os.path.join(index_dir, "breach.idx")):
+        print("[INFO] Reusing the built index", file=sys.stderr)
+    else:
+        results["build"] = build_phase(manifest, index_dir, env)
+    print("[INFO] Measuring lookups", file=sys.stderr)
+    results["lookup"] = lookup_phase(manifest, env, args.scans)
+    print("[INFO] Measuring the audit", file=sys.stderr)
+    with tempfile.TemporaryDirectory(prefix="passmimi-bench-") as work_dir:
+        results["audit"] = audit_phase(manifest, env, args.audit_passwords, args.audit_workers, work_dir)
+        print("[INFO] Measuring the server", file=sys.stderr)
+        results["server"] = server_phase(manifest, env, args.web_workers, args.requests, args.concurrency,
+                                         args.batch_items, work_dir)
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "corpus": {key: manifest[key] for key in ("version", "size", "seed", "bytes", "files")},
+        "results": results,
+    }
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+# Sizes of the workload rather than measurements of it
+_WORKLOAD = ("errors", "items", "requests", "concurrency", "passwords", "breached", "workers")
+
+
+def _higher_is_better(metric):
+    return metric.endswith(("_per_second", "_per_minute"))
+
+
+def compare(old, new, threshold):
+    # Prints each metric side by side; returns the metrics that got worse by more than threshold percent
+    if old.get("corpus") != new.get("corpus"):
+        print(f"[WARN] Different corpora: {old.get('corpus')} vs {new.get('corpus')}")
+    before, after = dict(_flatten(old["results"])), dict(_flatten(new["results"]))
+    regressions = []
+    print(f"{'metric':<44} {'before':>14} {'after':>14} {'change':>9}")
+    for metric in sorted(before.keys() | after.keys()):
+        a, b = before.get(metric), after.get(metric)
+        if a is None or b is None or not a:
+            print(f"{metric:<44} {a if a is not None else '-':>14} {b if b is not None else '-':>14}")
+            continue
+        change = (b - a) / a * 100
+        worse = -change if _higher_is_better(metric) else change
+        flag = ""
+        if threshold is not None and worse > threshold and not metric.endswith(_WORKLOAD):
+            regressions.append(metric)
+            flag = "  <-- regression"
+        print(f"{metric:<44} {a:>14} {b:>14} {change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PassMimi end to end on a synthetic corpus.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="generate or reuse a corpus and measure every phase")
+    p.add_argument("--size", type=parse_size, default=parse_size("10MB"), help="corpus size, 10MB to 10GB")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--corpus", help="corpus directory (default: one per size and seed in the temp directory)")
+    p.add_argument("--reuse-index", action="store_true", help="skip the build phase when the index exists")
+    p.add_argument("--scans", type=int, default=3, help="raw wordlist scans to time (0 to skip)")
+    p.add_argument("--audit-passwords", type=int, default=100000)
+    p.add_argument("--audit-workers", type=int, default=None)
+    p.add_argument("--web-workers", type=int, default=None, help="gunicorn workers (default: gunicorn.conf.py)")
+    p.add_argument("-n", "--requests", type=int, default=2000)
+    p.add_argument("-c", "--concurrency", type=int, default=50)
+    p.add_argument("--batch-items", type=int, default=20000)
+    p.add_argument("--out", help="write results here instead of stdout")
+    p = sub.add_parser("compare", help="show per-metric changes between two result files")
+    p.add_argument("before")
+    p.add_argument("after")
+    p.add_argument("--fail-over", type=float, default=None, metavar="PERCENT",
+                   help="exit non-zero when a metric gets worse by more than this")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.before, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.after, "r", encoding="utf-8") as f:
+            new = json.load(f)
+        return 1 if compare(old, new, args.fail_over) else 0
+
+    results = run(args)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"[INFO] Results written to {args.out}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import argparse, json, os, random, re, string, sys, time
+
+# ========================== SYNTHETIC WORDLIST CORPORA ==========================
+# Generates wordlists shaped like the three real sources, so benchmarks run
+# anywhere without downloading gigabytes of leaks:
+#
+#   rockyou.txt   one file of short, mostly lowercase passwords, LF endings
+#   SecLists/     a tree of many small and medium files, some with CRLF
+#                 endings, overlapping each other and rockyou
+#   Weakpass.txt  one large file of longer passwords with mixed case,
+#                 symbols and leet substitutions
+#
+# Output is a pure function of (size, seed). A manifest records both, and
+# generating again with the same parameters reuses the files. The manifest
+# also carries passwords known to be in the corpus and ones known not to be
+# (no generator emits "~"), for lookup benchmarks.
+GENERATOR_VERSION = 1
+MANIFEST_NAME = "corpus.json"
+# Share of the requested bytes given to each source
+SHARES = {"rockyou": 0.2, "SecLists": 0.1, "Weakpass": 0.7}
+LINES_PER_BLOCK = 20000
+SAMPLES = 1000
+_SIZE = re.compile(r"^\s*([0-9.]+)\s*([KMGT]?)i?B?\s*$", re.I)
+
+
+def parse_size(text):
+    # "10MB", "1.5G", "10GiB" or plain bytes
+    match = _SIZE.match(text)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"not a size: {text!r}")
+    return int(float(match.group(1)) * 1024 ** " KMGT".index((match.group(2) or " ").upper()))
+
+
+def _vocabulary(rng, count, min_syllables, max_syllables):
+    syllables = ["ka", "lo", "mi", "ne", "ra", "to", "su", "an", "el", "or", "ch", "st", "ia", "be", "ly",
+                 "da", "ri", "mo", "ve", "ton", "ster", "ba", "qu", "zz", "ly", "er", "in", "jo", "pe"]
+    return ["".join(rng.choices(syllables, k=rng.randint(min_syllables, max_syllables))) for _ in range(count)]
+
+
+_LEET = str.maketrans("aeiost", "43105+")
+
+
+class _Shape:
+    # Draws passwords a block at a time; every line is ASCII without "~"
+    def __init__(self, rng, words, suffixes, capitalize, leet, symbols, newline="\n"):
+        self.rng, self.words, self.suffixes = rng, words, suffixes
+        self.capitalize, self.leet, self.symbols, self.newline = capitalize, leet, symbols, newline
+
+    def block(self):
+        rng, k = self.rng, LINES_PER_BLOCK
+        words = rng.choices(self.words, k=k)
+        suffixes = rng.choices(self.suffixes, k=k)
+        lines = []
+        for word, suffix, roll in zip(words, suffixes, (rng.random() for _ in range(k))):
+            if roll < self.capitalize:
+                word = word.capitalize()
+            if roll > 1 - self.leet:
+                word = word.translate(_LEET)
+            if roll > 1 - self.symbols:
+                suffix += rng.choice("!@#$%^&*?")
+            lines.append(word + suffix)
+        return lines
+
+
+def _shapes(seed):
+    rng = random.Random(seed)
+    digits = [str(n) for n in range(100)] + [str(n) for n in range(1950, 2031)] + ["123", "1234", "12345", "007"]
+    rockyou = _Shape(random.Random(seed + 1), _vocabulary(rng, 50000, 1, 3), [""] * 60 + digits,
+                     capitalize=0.08, leet=0.02, symbols=0.03)
+    seclists = _Shape(random.Random(seed + 2), _vocabulary(rng, 20000, 1, 3), [""] * 20 + digits,
+                      capitalize=0.1, leet=0.05, symbols=0.05)
+    weakpass = _Shape(random.Random(seed + 3), _vocabulary(rng, 200000, 2, 5),
+                      [""] * 10 + digits + ["".join(rng.choices(string.digits, k=rng.randint(3, 6))) for _ in range(5000)],
+                      capitalize=0.35, leet=0.15, symbols=0.25)
+    return rockyou, seclists, weakpass
+
+
+def _write_file(path, shape, target_bytes, samples, rng):
+    # Writes blocks until the file reaches target_bytes; keeps a reservoir of lines
+    written = lines = 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="ascii", newline="") as f:
+        while written < target_bytes:
+            block = shape.block()
+            data = shape.newline.join(block) + shape.newline
+            f.write(data)
+            written += len(data)
+            for line in block[::97]:
+                lines += 1
+                if len(samples) < SAMPLES:
+                    samples.append(line)
+                elif rng.random() < SAMPLES / lines:
+                    samples[rng.randrange(SAMPLES)] = line
+    return written
+
+
+def generate(out_dir, size, seed=1):
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    expected = {"version": GENERATOR_VERSION, "size": size, "seed": seed}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if all(manifest.get(key) == value for key, value in expected.items()):
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    started = time.perf_counter()
+    rockyou, seclists, weakpass = _shapes(seed)
+    rng = random.Random(seed + 4)
+    samples, files = [], {}
+    files["rockyou.txt"] = _write_file(os.path.join(out_dir, "rockyou.txt"), rockyou, size * SHARES["rockyou"],
+                                       samples, rng)
+    # SecLists: a long tail of small files and a few medium ones, mixed endings
+    remaining, number = size * SHARES["SecLists"], 0
+    while remaining > 0:
+        number += 1
+        target = min(remaining, rng.choice((16 << 10, 64 << 10, 256 << 10, 4 << 20)))
+        seclists.newline = "\r\n" if number % 3 == 0 else "\n"
+        category = ("Common-Credentials", "Leaked-Databases", "Default-Credentials")[number % 3]
+        name = os.path.join("SecLists", "Passwords", category, f"list-{number:04d}.txt")
+        files[name] = _write_file(os.path.join(out_dir, name), seclists, target, samples, rng)
+        remaining -= files[name]
+    files["Weakpass.txt"] = _write_file(os.path.join(out_dir, "Weakpass.txt"), weakpass, size * SHARES["Weakpass"],
+                                        samples, rng)
+
+    absent = [f"absent~{rng.getrandbits(48):012x}" for _ in range(SAMPLES)]
+    manifest = dict(expected, bytes=sum(files.values()), files=len(files),
+                    sources=[os.path.join(out_dir, name) for name in ("rockyou.txt", "SecLists", "Weakpass.txt")],
+                    generate_s=round(time.perf_counter() - started, 1), present=samples, absent=absent)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic rockyou/SecLists/Weakpass-shaped wordlists.")
+    parser.add_argument("out", help="directory to write the corpus to")
+    parser.add_argument("--size", type=parse_size, default=parse_size("10MB"), help="total size, e.g. 10MB or 10GB")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    manifest = generate(args.out, args.size, args.seed)
+    print(f"[INFO] {manifest['files']} files, {manifest['bytes'] / 2**20:.1f} MiB in {args.out} "
+          f"(generated in {manifest['generate_s']}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
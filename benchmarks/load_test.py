@@ -0,0 +1,90 @@
+import argparse, asyncio, json, sys, time
+from urllib.parse import urlencode, urlsplit
+
+# ========================== /check LOAD TEST ==========================
+# Fires concurrent POST /check requests at one or more running servers and
+# reports throughput and latency, e.g. to compare the WSGI and ASGI modes:
+#
+#   gunicorn -w 4 -b :8000 app:app
+#   uvicorn --port 8001 asgi:application
+#   python benchmarks/load_test.py http://127.0.0.1:8000 http://127.0.0.1:8001
+#
+# Uses only the standard library, one connection per request, so it measures
+# the same thing against any server.
+
+
+async def _post(host, port, path, body):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n"
+                      f"Content-Type: application/x-www-form-urlencoded\r\n"
+                      f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def run_load(url, requests, concurrency, passwords):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path.rstrip("/") + "/check"
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        for i in counter:
+            body = urlencode({"password": passwords[i % len(passwords)]}).encode()
+            started = time.perf_counter()
+            try:
+                status = await _post(host, port, path, body)
+            except OSError:
+                status = None
+            if status != 200:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1) if latencies else None
+    return {
+        "url": url,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test POST /check on one or more servers.")
+    parser.add_argument("urls", nargs="+", help="base URLs, e.g. http://127.0.0.1:8000")
+    parser.add_argument("-n", "--requests", type=int, default=1000)
+    parser.add_argument("-c", "--concurrency", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    passwords = ["Password123!", "hunter2", "correct horse battery staple", "Tr0ub4dor&3", "qwerty"]
+    results = [asyncio.run(run_load(url, args.requests, args.concurrency, passwords)) for url in args.urls]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'url':<28} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['url']:<28} {r['requests_per_second']:>8} {r['p50_ms']:>9} {r['p99_ms']:>9} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import argparse, math, mmap, os, struct, sys, time
+
+from config import WORDLIST_PATHS, INDEX_PATH, BLOOM_PATH, BLOOM_FP_RATE
+import wordlist_index
+
+# ========================== BLOOM FILTER ==========================
+# A compact, probabilistic "definitely not breached" test. Bit positions are
+# derived from the SHA-1 digests the wordlist index already uses, so a
+# password is hashed once no matter how many structures it is checked against.
+MAGIC = b"PMBLM\x00"
+VERSION = 1
+HEADER = struct.Struct("<6sHQQQd")  # magic, version, bits, hashes, entries, fp rate
+HEADER_SIZE = 64
+
+
+def optimal_parameters(entries, fp_rate):
+    entries = max(entries, 1)
+    bits = max(8, int(math.ceil(-entries * math.log(fp_rate) / (math.log(2) ** 2))))
+    hashes = max(1, int(round(bits / entries * math.log(2))))
+    return bits, hashes
+
+
+class BloomFilter:
+    def __init__(self, bits, hashes, entries=0, fp_rate=BLOOM_FP_RATE, data=None):
+        self.bits = bits
+        self.hashes = hashes
+        self.entries = entries
+        self.fp_rate = fp_rate
+        self._data = data if data is not None else bytearray((bits + 7) // 8)
+        self._mm = None
+        self.hits = 0
+        self.misses = 0
+        self.false_positives = 0
+
+    @classmethod
+    def for_capacity(cls, entries, fp_rate=BLOOM_FP_RATE):
+        bits, hashes = optimal_parameters(entries, fp_rate)
+        return cls(bits, hashes, fp_rate=fp_rate)
+
+    def _positions(self, digest):
+        # Kirsch-Mitzenmacher double hashing over two 64-bit halves of the digest
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        bits = self.bits
+        return ((h1 + i * h2) % bits for i in range(self.hashes))
+
+    def add(self, digest):
+        data = self._data
+        for pos in self._positions(digest):
+            data[pos >> 3] |= 1 << (pos & 7)
+        self.entries += 1
+
+    def __contains__(self, digest):
+        data = self._data
+        for pos in self._positions(digest):
+            if not data[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def might_contain_password(self, password):
+        if any(key in self for key in wordlist_index.password_keys(password)):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    @property
+    def size_bytes(self):
+        return len(self._data)
+
+    def expected_fp_rate(self):
+        # Theoretical rate for the number of entries actually inserted
+        if not self.entries:
+            return 0.0
+        return (1 - math.exp(-self.hashes * self.entries / self.bits)) ** self.hashes
+
+    def stats(self):
+        checked = self.hits + self.misses
+        return {
+            "size_bytes": self.size_bytes,
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "entries": self.entries,
+            "target_fp_rate": self.fp_rate,
+            "expected_fp_rate": self.expected_fp_rate(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "false_positives": self.false_positives,
+            "reject_ratio": self.misses / checked if checked else 0.0,
+        }
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.bits, self.hashes, self.entries, self.fp_rate)
+                    .ljust(HEADER_SIZE, b"\x00"))
+            f.write(self._data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            magic, version, bits, hashes, entries, fp_rate = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a PassMimi bloom filter (version {VERSION})")
+            # Map read-only so the bits stay in the shared page cache
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        bloom = cls(bits, hashes, entries, fp_rate, data=memoryview(mm)[HEADER_SIZE:])
+        bloom._mm = mm
+        return bloom
+
+
+def load_filter(path=BLOOM_PATH):
+    if not os.path.exists(path):
+        return None
+    return BloomFilter.load(path)
+
+
+# ========================== BUILDING ==========================
+def estimate_entries(sources=WORDLIST_PATHS, index_path=INDEX_PATH):
+    index = wordlist_index.open_index(index_path)
+    if index is not None:
+        index.close()
+        return len(index)
+    return sum(1 for _ in wordlist_index.iter_digests(sources, index_path))
+
+
+def build_filter(sources=WORDLIST_PATHS, fp_rate=BLOOM_FP_RATE, index_path=INDEX_PATH):
+    bloom = BloomFilter.for_capacity(estimate_entries(sources, index_path), fp_rate)
+    for digest in wordlist_index.iter_digests(sources, index_path):
+        bloom.add(digest)
+    return bloom
+
+
+# ========================== CLI ==========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the PassMimi breached-password bloom filter.")
+    parser.add_argument("sources", nargs="*", default=WORDLIST_PATHS)
+    parser.add_argument("--fp-rate", type=float, default=BLOOM_FP_RATE)
+    parser.add_argument("--index", default=INDEX_PATH)
+    parser.add_argument("--out", default=BLOOM_PATH)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    bloom = build_filter(args.sources, args.fp_rate, args.index)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    bloom.save(args.out)
+    stats = bloom.stats()
+    print(f"[INFO] Bloom filter: {stats['entries']} entries, {stats['size_bytes'] / 2**20:.1f} MiB, "
+          f"{stats['hashes']} hashes, expected FP rate {stats['expected_fp_rate']:.4%} "
+          f"-> {args.out} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import os, sys
+
+# Location awareness for PyInstaller portable wrapper
+if getattr(sys, 'frozen', False):
+    basedir = sys._MEIPASS
+else:
+    basedir = os.path.dirname(os.path.abspath(__file__))
+
+# ========================== CONFIGURATION ==========================
+LOGO_PATH = os.path.join(basedir, "static", "logo.png")
+WORDLIST_DIR = os.path.join(basedir, "wordlists")
+WORDLIST_PATHS = [
+    os.path.join(WORDLIST_DIR, "rockyou.txt"),
+    os.path.join(WORDLIST_DIR, "SecLists"),
+    os.path.join(WORDLIST_DIR, "Weakpass.txt")
+]
+THEME_COLOR = "#00f7ff"
+PRIMARY_DARK = "#00c4cc"
+SECONDARY_COLOR = "#8a2be2"
+BACKGROUND_COLOR = "#0a0f1c"
+SURFACE_COLOR = "#121a2e"
+SURFACE_LIGHT = "#1a243c"
+TEXT_COLOR = "#e0ffff"
+TEXT_SECONDARY = "#a0b3c6"
+DANGER_COLOR = "#ff4757"
+WARNING_COLOR = "#ffa502"
+SUCCESS_COLOR = "#23ac5c"
+INFO_COLOR = "#1e90ff"
+
+# ========================== WORDLIST DOWNLOAD ==========================
+# Archive fetched by post_install.py (Dropbox direct download link, dl=1).
+# Set PASSMIMI_WORDLIST_SHA256 to the archive's hex digest to verify it.
+WORDLIST_URL = os.environ.get(
+    "PASSMIMI_WORDLIST_URL",
+    "https://www.dropbox.com/scl/fi/8bxum1rn8j2iw97i44izk/wordlists.zip?rlkey=kxijb72ndw90pkkn30nrcrroh&st=pmwi2iji&dl=1")
+WORDLIST_SHA256 = os.environ.get("PASSMIMI_WORDLIST_SHA256", "")
+# Attempts per download before giving up; each one resumes where the last stopped
+DOWNLOAD_RETRIES = int(os.environ.get("PASSMIMI_DOWNLOAD_RETRIES", 5))
+
+# ========================== WORDLIST INDEX ==========================
+# The merged hash index lives next to the wordlists (see wordlist_index.py)
+INDEX_DIR = os.environ.get("PASSMIMI_INDEX_DIR", os.path.join(basedir, "wordlists", "index"))
+INDEX_PATH = os.path.join(INDEX_DIR, "breach.idx")
+# Size, mtime and content hash of every indexed file, for `update-index`
+MANIFEST_PATH = os.path.join(INDEX_DIR, "breach.manifest.json")
+# Second index of normalized forms ("P@ssw0rd!" -> "password"), built with
+# `wordlist_index.py build-normalized`; shorter base words are not indexed
+NORMALIZED_INDEX_PATH = os.path.join(INDEX_DIR, "breach.normalized.idx")
+NORMALIZED_MIN_LENGTH = int(os.environ.get("PASSMIMI_NORMALIZED_MIN_LENGTH", 4))
+# How often (seconds) running servers check whether the index was swapped
+INDEX_RELOAD_INTERVAL = float(os.environ.get("PASSMIMI_INDEX_RELOAD_INTERVAL", 5))
+# Records held in memory per sorted run while building the index (24 bytes each)
+INDEX_CHUNK_RECORDS = int(os.environ.get("PASSMIMI_INDEX_CHUNK_RECORDS", 1_000_000))
+
+# ========================== BREACH FILTER ==========================
+# Bloom filter consulted before any exact lookup (see breach_filter.py)
+BLOOM_PATH = os.environ.get("PASSMIMI_BLOOM_PATH", os.path.join(INDEX_DIR, "breach.bloom"))
+BLOOM_FP_RATE = float(os.environ.get("PASSMIMI_BLOOM_FP_RATE", 0.001))
+
+# ========================== HASH-PREFIX RANGES ==========================
+# Sharded bucket files behind GET /range/<prefix> (see range_buckets.py)
+RANGE_DIR = os.environ.get("PASSMIMI_RANGE_DIR", os.path.join(INDEX_DIR, "range"))
+# Buckets only change when the wordlists do; let caches and CDNs keep them
+RANGE_MAX_AGE = int(os.environ.get("PASSMIMI_RANGE_MAX_AGE", 86400))
+
+# ========================== CUSTOM BANNED LISTS ==========================
+# Organization-specific lists (company and product names, recently phished
+# passwords), one file per list, compiled into memory and reloaded when the
+# directory changes (see banned_lists.py)
+BANNED_DIR = os.environ.get("PASSMIMI_BANNED_DIR", os.path.join(WORDLIST_DIR, "banned"))
+# How often (seconds) each process checks the directory for changes
+BANNED_RELOAD_INTERVAL = float(os.environ.get("PASSMIMI_BANNED_RELOAD_INTERVAL", 5))
+
+# ========================== WORDLIST SCAN ==========================
+# Fallback when no index exists: files are streamed in blocks of this size
+SCAN_CHUNK_SIZE = int(os.environ.get("PASSMIMI_SCAN_CHUNK_SIZE", 1 << 20))
+# Lines longer than this cannot be passwords and are skipped without buffering
+SCAN_MAX_LINE = 64 * 1024
+# Worker processes for the parallel scan; 0 or 1 keeps the sequential scan
+SCAN_WORKERS = int(os.environ.get("PASSMIMI_SCAN_WORKERS", 0))
+# Files are split into byte ranges of about this size and small files batched
+# together, so workers get equal amounts of I/O rather than equal file counts
+SCAN_SEGMENT_BYTES = int(os.environ.get("PASSMIMI_SCAN_SEGMENT_BYTES", 64 << 20))
+# Parallel scans that may be in flight at once (each holds a cancel flag)
+SCAN_MAX_CONCURRENT = 64
+
+# ========================== PATTERN RATING ==========================
+# Passwords whose structure (keyboard walks, sequences, repeats, dates) can be
+# guessed faster than these many seconds by the default attacker are capped
+# at Weak and Moderate respectively (see patterns.py)
+PATTERN_WEAK_SECONDS = float(os.environ.get("PASSMIMI_PATTERN_WEAK_SECONDS", 3600))
+PATTERN_MODERATE_SECONDS = float(os.environ.get("PASSMIMI_PATTERN_MODERATE_SECONDS", 31536000))
+
+# ========================== CHECK REQUESTS ==========================
+# Deliberate pause before a single /check answers (the UI's loading animation)
+CHECK_DELAY = float(os.environ.get("PASSMIMI_CHECK_DELAY", 1.5))
+
+# ========================== BATCH CHECKS ==========================
+# Threads evaluating /check/batch items and how many may be in flight at once
+BATCH_WORKERS = int(os.environ.get("PASSMIMI_BATCH_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+BATCH_MAX_IN_FLIGHT = int(os.environ.get("PASSMIMI_BATCH_MAX_IN_FLIGHT", 256))
+
+# ========================== BULK AUDIT ==========================
+# Passwords handed to an audit worker per task, and tasks queued per worker
+AUDIT_CHUNK_SIZE = int(os.environ.get("PASSMIMI_AUDIT_CHUNK_SIZE", 5000))
+AUDIT_QUEUE_DEPTH = 2
+
+# ========================== ASGI SERVING ==========================
+# Threads running evaluations for the async server, and the number of checks
+# one process accepts at once; waiting requests cost a coroutine, not a thread
+ASGI_WORKERS = int(os.environ.get("PASSMIMI_ASGI_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+ASGI_MAX_IN_FLIGHT = int(os.environ.get("PASSMIMI_ASGI_MAX_IN_FLIGHT", 4096))
+
+# ========================== RESULT CACHE ==========================
+# Repeated passwords reuse their /check result (see result_cache.py).
+# CACHE_SIZE entries per process (0 disables), CACHE_TTL seconds. The sqlite
+# backend also shares results between gunicorn workers through CACHE_PATH.
+CACHE_SIZE = int(os.environ.get("PASSMIMI_CACHE_SIZE", 10000))
+CACHE_TTL = float(os.environ.get("PASSMIMI_CACHE_TTL", 300))
+CACHE_BACKEND = os.environ.get("PASSMIMI_CACHE_BACKEND", "memory")
+CACHE_PATH = os.environ.get("PASSMIMI_CACHE_PATH", os.path.join(INDEX_DIR, "results.sqlite3"))
+CACHE_SHARED_SIZE = int(os.environ.get("PASSMIMI_CACHE_SHARED_SIZE", 100000))
+# Hex HMAC key; unset means a random key generated once per process
+CACHE_SECRET = os.environ.get("PASSMIMI_CACHE_SECRET")
+
+# ========================== METRICS ==========================
+# Prometheus text on GET /metrics (see metrics.py). With several worker
+# processes, each writes its values under METRICS_DIR and a scrape sums them;
+# gunicorn.conf.py sets a directory up. Unset, /metrics covers one process.
+METRICS_DIR = os.environ.get("PASSMIMI_METRICS_DIR", "")
+# Most often (seconds) a process rewrites its file while values change
+METRICS_FLUSH_INTERVAL = float(os.environ.get("PASSMIMI_METRICS_FLUSH_INTERVAL", 1))
+
+# ========================== PROFILING ==========================
+# Fraction of /check and /check/batch requests sampled by profiler.py (0 is
+# off), seconds between stack samples, and where the profiles are written
+PROFILE_RATE = float(os.environ.get("PASSMIMI_PROFILE_RATE", 0))
+PROFILE_INTERVAL = float(os.environ.get("PASSMIMI_PROFILE_INTERVAL", 0.001))
+PROFILE_DIR = os.environ.get("PASSMIMI_PROFILE_DIR", os.path.join(basedir, "profiles"))
+
+# ========================== ADMIN ==========================
+# Bearer token for the /admin routes; unset, they answer 404
+ADMIN_TOKEN = os.environ.get("PASSMIMI_ADMIN_TOKEN", "")
@@ -0,0 +1,75 @@
+import math
+
+# ========================== ATTACKER MODELS ==========================
+# Guesses per second for each attacker. offline_fast_hash keeps the original
+# 1e11 guesses/sec, so the headline "crack_time" is unchanged.
+ATTACKER_PROFILES = {
+    "online_throttled": 100 / 3600,   # rate-limited login form, ~100 attempts/hour
+    "online_unthrottled": 10,         # login endpoint with no lockout
+    "offline_bcrypt": 1e4,            # stolen bcrypt (cost 10) hashes on a GPU rig
+    "offline_fast_hash": 1e11,        # stolen MD5/SHA-1/NTLM hashes on a GPU cluster
+}
+DEFAULT_PROFILE = "offline_fast_hash"
+
+# ========================== LOOKUP TABLES ==========================
+# Everything runs on log10 values, so the cost is the same for an 8-character
+# password and a 10,000-character passphrase. log10(pool) is precomputed for
+# each combination of character classes (bit 0 lower, 1 upper, 2 digit, 3 symbol).
+_CLASS_POOLS = (26, 26, 10, 32)
+LOG10_POOL = []
+for _mask in range(16):
+    _pool = sum(size for bit, size in enumerate(_CLASS_POOLS) if _mask >> bit & 1) or 26
+    LOG10_POOL.append(math.log10(_pool))
+LOG10_RATES = {name: math.log10(rate) for name, rate in ATTACKER_PROFILES.items()}
+_RATE_ITEMS = tuple(LOG10_RATES.items())
+
+MINUTE, HOUR, DAY, YEAR = 60, 3600, 86400, 31536000
+# (upper bound in log10 seconds, divisor, unit) checked in order
+_DISPLAY_STEPS = (
+    (math.log10(MINUTE), 1, "Secs"),
+    (math.log10(HOUR), MINUTE, "Mins"),
+    (math.log10(DAY), HOUR, "Hours"),
+    (math.log10(YEAR), DAY, "Days"),
+    (math.log10(100 * YEAR), YEAR, "Yrs"),
+)
+
+
+def log10_pool(features):
+    mask = ((features.lower_count > 0) | (features.upper_count > 0) << 1
+            | (features.digit_count > 0) << 2 | (features.symbol_count > 0) << 3)
+    return LOG10_POOL[mask]
+
+
+def log10_guesses(features):
+    return features.length * log10_pool(features)
+
+
+def display_time(log_seconds):
+    if log_seconds < 0:
+        return "Instantly"
+    for limit, divisor, unit in _DISPLAY_STEPS:
+        if log_seconds < limit:
+            # Only small values are ever exponentiated back
+            return f"{int(10 ** log_seconds / divisor)} {unit}"
+    return "100+ Years"
+
+
+def estimate_all(features, log_guesses=None):
+    if log_guesses is None:
+        log_guesses = log10_guesses(features)
+    empty = features.length == 0
+    guesses = round(log_guesses, 3)
+    return {
+        name: {
+            "guesses_log10": guesses,
+            "seconds_log10": round(log_guesses - log_rate, 3),
+            "display": "Instantly" if empty else display_time(log_guesses - log_rate),
+        }
+        for name, log_rate in _RATE_ITEMS
+    }
+
+
+def estimate_crack_time(features, profile=DEFAULT_PROFILE):
+    if features.length == 0:
+        return "Instantly"
+    return display_time(log10_guesses(features) - LOG10_RATES[profile])
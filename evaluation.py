@@ -0,0 +1,421 @@
+import json, math, os, time
+
+from config import (
+    INDEX_PATH, NORMALIZED_INDEX_PATH, BLOOM_PATH, RANGE_DIR, INDEX_RELOAD_INTERVAL,
+    PATTERN_WEAK_SECONDS, PATTERN_MODERATE_SECONDS,
+    THEME_COLOR, DANGER_COLOR, WARNING_COLOR, SUCCESS_COLOR,
+)
+from crack_time import DEFAULT_PROFILE, LOG10_RATES, estimate_all, log10_pool
+from features import PasswordFeatures
+import banned_lists, breach_filter, metrics, patterns, range_buckets, result_cache, wordlist_index, wordlist_scan
+
+# ========================== WORDLIST CHECK ==========================
+# The merged index and bloom filter are opened once and shared by every
+# request; without an index we fall back to streaming the raw wordlists.
+# `update-index` swaps files in with a rename, so we periodically compare the
+# inode and reopen when it changes. In-flight lookups keep the old mapping.
+_loaded = {}
+
+def _load_current(name, path, loader):
+    entry = _loaded.get(name)
+    now = time.monotonic()
+    if entry is not None and now - entry[2] < INDEX_RELOAD_INTERVAL:
+        return entry[1]
+    try:
+        st = os.stat(path)
+        key = (st.st_ino, st.st_mtime_ns)
+    except OSError:
+        key = None
+    if entry is not None and entry[0] == key:
+        _loaded[name] = (key, entry[1], now)
+        return entry[1]
+    try:
+        obj = loader(path) if key is not None else None
+    except (OSError, ValueError):
+        obj = None
+    _loaded[name] = (key, obj, now)
+    return obj
+
+def get_index():
+    return _load_current("index", INDEX_PATH, wordlist_index.open_index)
+
+def get_normalized_index():
+    return _load_current("normalized", NORMALIZED_INDEX_PATH, wordlist_index.open_index)
+
+def get_filter():
+    return _load_current("bloom", BLOOM_PATH, breach_filter.load_filter)
+
+def get_range_bucket(shard, bucket):
+    # (body, etag) for one hash-prefix bucket, or None until the buckets are built
+    shard_file = _load_current(f"range:{shard}", range_buckets.shard_path(RANGE_DIR, shard), range_buckets.RangeShard)
+    return shard_file.bucket(bucket) if shard_file is not None else None
+
+def check_in_wordlists(password, scan=True):
+    # Most passwords are in no breach list; the filter proves that without touching disk
+    started = time.perf_counter()
+    bloom = get_filter()
+    if bloom is not None:
+        maybe = bloom.might_contain_password(password)
+        metrics.wordlist_stage("filter", started)
+        metrics.lookup("filter", "positive" if maybe else "negative")
+        if not maybe:
+            return []
+    found_lists = _lookup_wordlists(password, scan)
+    if found_lists is None:
+        # Nothing checked the filter's "maybe", so it is no false positive either
+        return []
+    if bloom is not None and not found_lists:
+        bloom.false_positives += 1
+        metrics.filter_false_positive()
+    return found_lists
+
+def _lookup_wordlists(password, scan):
+    # The lists holding the password, or None when no index or scan could check
+    started = time.perf_counter()
+    index = get_index()
+    if index is not None:
+        found_lists = index.lookup(password)
+        metrics.wordlist_stage("index", started)
+        metrics.lookup("index", "hit" if found_lists else "miss")
+        return found_lists
+    # Bulk callers pass scan=False: a full scan per password is never worth it
+    if not scan:
+        return None
+    found_lists = wordlist_scan.check_wordlists(password)
+    metrics.wordlist_stage("scan", started)
+    metrics.lookup("scan", "hit" if found_lists else "miss")
+    return found_lists
+
+def check_normalized(password):
+    # (base word, source lists) when a leet/case/suffix variant of the password
+    # is breached; one extra lookup in the normalized index, no variant expansion
+    index = get_normalized_index()
+    if index is None:
+        return None
+    variant = _find_normalized(index, password)
+    metrics.lookup("normalized", "hit" if variant is not None else "miss")
+    return variant
+
+def _find_normalized(index, password):
+    for base in wordlist_index.normalized_forms(password):
+        found_lists = index.lookup_keys([wordlist_index.password_digest(base)])
+        if found_lists:
+            return base.decode("utf-8", errors="replace"), found_lists
+    return None
+
+def add_base_word(result, password):
+    # The base word is the password minus its mutations, so results that are
+    # cached or go to batch callers leave it out; the interactive /check
+    # routes, which answer the person who typed the password, add it back
+    if "variant_of" not in result:
+        return result
+    index = get_normalized_index()
+    variant = _find_normalized(index, password) if index is not None else None
+    if variant is not None:
+        base_word = variant[0]
+        result["variant_of"] = dict(result["variant_of"], base_word=base_word)
+        result["suggestion"] = (f"Based on the breached word \"{base_word}\"; cracking tools try case changes, "
+                                "symbol swaps and added digits first. Choose an unrelated passphrase.")
+    return result
+
+def check_banned(password):
+    # (list names, "exact" or "variant") when a custom banned list holds the password
+    banned = banned_lists.get_banned().lookup(password)
+    metrics.lookup("banned", "hit" if banned else "miss")
+    return banned
+
+# Callers that already ran check_banned pass its result as `banned=`
+_UNCHECKED = object()
+
+# ========================== EVALUATION LOGIC ==========================
+def summarize_lists(found_lists, limit=3):
+    if len(found_lists) <= limit:
+        return ', '.join(found_lists)
+    return f"{', '.join(found_lists[:limit])} and {len(found_lists) - limit} more"
+
+def find_structure(password, features):
+    # (log10 guesses, patterns used) for the cheapest way to guess the password
+    return patterns.minimum_guesses(password, log10_pool(features))
+
+def evaluate_password(password, scan=True, features=None, structure=None, banned=_UNCHECKED):
+    features = features or PasswordFeatures(password)
+    details = features.details()
+
+    # Rule 7a: Organization banned lists, reported apart from the public breach lists
+    if banned is _UNCHECKED:
+        banned = check_banned(password)
+    if banned is not None:
+        banned_names, match = banned
+        remark = "Banned by your organization" if match == "exact" else "Variant of a password banned by your organization"
+        return {
+            "rating": 1,
+            "strength": "Very Weak",
+            "circle_color": DANGER_COLOR,
+            "remark": f"⛔ {remark} ({summarize_lists(banned_names)})",
+            "banned": {"lists": banned_names, "match": match},
+            "details": details,
+            "suggestion": "This password or a close variant is on your organization's banned list; choose another.",
+        }
+
+    # Rule 7: Check the public wordlists - if found, rating is 1
+    started = time.perf_counter()
+    found_lists = check_in_wordlists(password, scan)
+    metrics.check_stage("wordlist", started)
+    if found_lists:
+        return {
+            "rating": 1,
+            "strength": "Very Weak",
+            "circle_color": DANGER_COLOR,
+            "remark": f"⚠️ Found in wordlists ({summarize_lists(found_lists)})",
+            "found_in": found_lists,
+            "details": details,
+            "suggestion": "Password found in known data breaches; change immediately.",
+        }
+
+    # Rule 8: A predictable variant of a breached password is nearly as weak
+    started = time.perf_counter()
+    variant = check_normalized(password)
+    metrics.check_stage("normalized", started)
+    if variant is not None:
+        _, variant_lists = variant
+        return {
+            "rating": 1,
+            "strength": "Very Weak",
+            "circle_color": DANGER_COLOR,
+            "remark": f"⚠️ Variant of a breached password ({summarize_lists(variant_lists)})",
+            "variant_of": {"found_in": variant_lists},
+            "details": details,
+            "suggestion": "Based on a breached word; cracking tools try case changes, "
+                          "symbol swaps and added digits first. Choose an unrelated passphrase.",
+        }
+
+    return rate_without_lists(features, structure or find_structure(password, features), details)
+
+# The caps in log10 seconds; a cap of 0 disables it
+_LOG10_WEAK_SECONDS = math.log10(PATTERN_WEAK_SECONDS) if PATTERN_WEAK_SECONDS > 0 else -math.inf
+_LOG10_MODERATE_SECONDS = math.log10(PATTERN_MODERATE_SECONDS) if PATTERN_MODERATE_SECONDS > 0 else -math.inf
+
+def rate_without_lists(features, structure, details=None):
+    # Rules 1-6 and 9: length, character classes and structure, no wordlist lookup
+    result = _rate_by_length(features, details or features.details())
+
+    # Rule 9: Predictable structure caps the rating at how fast it can be guessed
+    log_guesses, used = structure
+    if used:
+        result["patterns"] = [{"pattern": name, "start": start, "end": end, "guesses_log10": round(guesses, 3)}
+                              for name, start, end, guesses in used]
+        # In log10 space: long passwords push the guess count past any float
+        log_seconds = log_guesses - LOG10_RATES[DEFAULT_PROFILE]
+        found = ", ".join(sorted({name.replace("_", " ") for name, _, _, _ in used}))
+        if log_seconds < _LOG10_WEAK_SECONDS and result["rating"] > 2:
+            result.update({
+                "rating": 2,
+                "strength": "Weak",
+                "circle_color": "#ff6633",
+                "remark": f"Password follows predictable patterns ({found})",
+                "suggestion": "Avoid keyboard walks, sequences, repeated characters and dates; "
+                              "use unrelated words or random characters.",
+            })
+        elif log_seconds < _LOG10_MODERATE_SECONDS and result["rating"] > 5:
+            result.update({
+                "rating": 5,
+                "strength": "Moderate",
+                "circle_color": WARNING_COLOR,
+                "remark": f"Password contains predictable patterns ({found})",
+                "suggestion": "Replace the keyboard walks, sequences, repeats or dates with less predictable text.",
+            })
+    return result
+
+def _rate_by_length(features, details):
+    length = features.length
+    has_upper = features.has_upper
+    upper_count = features.upper_count
+    digit_count = features.digit_count
+    symbol_count = features.symbol_count
+
+    # Rule 1: Under 6 characters
+    if length < 6:
+        return {
+            "rating": 1, 
+            "strength": "Very Weak", 
+            "circle_color": DANGER_COLOR,
+            "remark": "Password is too short", 
+            "details": details,
+            "suggestion": "Increase password length to at least 6 characters."
+        }
+    
+    # Rule 2: 6 to 10 characters
+    elif 6 <= length <= 10:
+        return {
+            "rating": 2, 
+            "strength": "Weak", 
+            "circle_color": "#ff6633",
+            "remark": "Password is too short", 
+            "details": details,
+            "suggestion": "Increase password length to at least 12 characters and add complexity."
+        }
+    
+    # Rule 3: 10 to 25 without symbols and uppercase
+    elif 10 < length <= 25 and (not has_upper or symbol_count == 0):
+        return {
+            "rating": 5, 
+            "strength": "Moderate", 
+            "circle_color": WARNING_COLOR,
+            "remark": "Password lacks complexity", 
+            "details": details,
+            "suggestion": "Add uppercase letters and special symbols to increase strength."
+        }
+    
+    # Rule 5: 22 to 30+ with symbols (at least 3) and uppercase (at least 2) and numbers (at least 3)
+    # Checked before Rule 4 to ensure the strictest condition isn't skipped by overlapping length constraints
+    elif length >= 22 and symbol_count >= 3 and upper_count >= 2 and digit_count >= 3:
+        return {
+            "rating": 10, 
+            "strength": "Very Strong", 
+            "circle_color": THEME_COLOR,
+            "remark": "Excellent password security!", 
+            "details": details,
+            "suggestion": "Perfect! This password meets all security criteria."
+        }
+        
+    # Rule 4: 18 to 25 with symbol and uppercase (and at least 3 numbers)
+    elif 18 <= length <= 25 and has_upper and symbol_count >= 1 and digit_count >= 3:
+        return {
+            "rating": 8, 
+            "strength": "Strong", 
+            "circle_color": SUCCESS_COLOR,
+            "remark": "Strong password with good complexity", 
+            "details": details,
+            "suggestion": "Excellent password! Consider making it longer for even better security."
+        }
+    
+    # Default case for passwords that don't match specific rules
+    else:
+        return {
+            "rating": 6, 
+            "strength": "Good", 
+            "circle_color": "#00ffcc",
+            "remark": "Password is good but could be stronger", 
+            "details": details,
+            "suggestion": "Add more character variety (uppercase, numbers, symbols) and increase length."
+        }
+
+def analyze_password(password, scan=True, features=None, structure=None, banned=_UNCHECKED):
+    # Features and structure are computed once here and read by both the rules and the estimate
+    features = features or PasswordFeatures(password)
+    if structure is None:
+        started = time.perf_counter()
+        structure = find_structure(password, features)
+        metrics.check_stage("patterns", started)
+    started = time.perf_counter()
+    result = evaluate_password(password, scan, features, structure, banned)
+    metrics.check_stage("evaluate", started)
+    return add_crack_times(result, features, structure)
+
+def add_crack_times(result, features, structure):
+    started = time.perf_counter()
+    if result.get("found_in") or result.get("variant_of") or result.get("banned"):
+        # Breached and banned passwords and their common mutations sit at the front of every attack dictionary
+        result["crack_time"] = "Instantly"
+        result["crack_times"] = estimate_all(features, log_guesses=0.0)
+    else:
+        result["crack_times"] = estimate_all(features, log_guesses=structure[0])
+        result["crack_time"] = result["crack_times"][DEFAULT_PROFILE]["display"]
+    metrics.check_stage("crack_time", started)
+    return result
+
+# ========================== RESULT CACHE ==========================
+_cache = result_cache.create_cache()
+
+def get_cache():
+    return _cache
+
+def _cached_result(password):
+    started = time.perf_counter()
+    result = _cache.get(password)
+    metrics.check_stage("cache", started)
+    metrics.lookup("cache", "hit" if result is not None else "miss")
+    return result
+
+def _store_result(password, result):
+    # Banned lists change at runtime; a banned verdict is never cached
+    if "banned" not in result:
+        _cache.set(password, result)
+    return dict(result)
+
+def _skip_cache(banned):
+    # A password banned after its result was cached must not get that result
+    return _cache is None or banned is not None
+
+def analyze_password_cached(password):
+    # Same result as analyze_password, reused for repeated passwords
+    banned = check_banned(password)
+    if _skip_cache(banned):
+        return analyze_password(password, banned=banned)
+    result = _cached_result(password)
+    if result is None:
+        result = _store_result(password, analyze_password(password, banned=banned))
+    return result
+
+# ========================== PROGRESSIVE CHECK ==========================
+# /check/stream answers in two steps. The estimate applies every rule that
+# needs no wordlist, so it is ready in microseconds; the result follows once
+# the breach lists were checked and is exactly what /check returns. The two
+# only differ when the password or a variant of it is breached. A cached
+# password has its result at once and skips the estimate.
+
+def analyze_password_progressive(password):
+    # Yields ("estimate", result) and then ("result", result); the breach
+    # lookup only runs when the caller asks for the second item
+    banned = check_banned(password)
+    result = None if _skip_cache(banned) else _cached_result(password)
+    if result is not None:
+        yield "result", add_base_word(result, password)
+        return
+    features = PasswordFeatures(password)
+    started = time.perf_counter()
+    structure = find_structure(password, features)
+    metrics.check_stage("patterns", started)
+    yield "estimate", add_crack_times(rate_without_lists(features, structure), features, structure)
+    result = analyze_password(password, features=features, structure=structure, banned=banned)
+    if _cache is not None:
+        result = _store_result(password, result)
+    yield "result", add_base_word(result, password)
+
+def server_sent_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+# ========================== BATCH ITEMS ==========================
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl", "application/jsonlines")
+INVALID_ITEM = object()
+
+def parse_batch_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return INVALID_ITEM
+
+def analyze_batch_item(position, item):
+    # Items are a bare password string or {"password": ..., "id": ...};
+    # results carry the position and id, never the password
+    result = {"index": position}
+    if item is INVALID_ITEM:
+        result["error"] = "invalid JSON"
+        return result
+    if isinstance(item, dict):
+        if "id" in item:
+            result["id"] = item["id"]
+        item = item.get("password")
+    if not isinstance(item, str):
+        result["error"] = "password must be a string"
+        return result
+    try:
+        result.update(analyze_password_cached(item))
+    except Exception as e:
+        # One bad item must not end the stream; the message never names the password
+        print(f"[WARN] Batch item {position} failed: {type(e).__name__}")
+        result["error"] = f"evaluation failed ({type(e).__name__})"
+    return result
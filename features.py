@@ -0,0 +1,119 @@
+# ========================== PASSWORD FEATURES ==========================
+# Character-class counts computed once per password and shared by the rating
+# rules and the crack-time estimate. Symbols are the same set the original
+# regex matched.
+SYMBOLS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+UPPER, LOWER, DIGIT, SYMBOL = 1, 2, 3, 4
+
+
+class PasswordFeatures:
+    __slots__ = ("length", "upper_count", "lower_count", "digit_count", "symbol_count")
+
+    def __init__(self, password=""):
+        upper = lower = digit = symbol = 0
+        for c in password:
+            if c in SYMBOLS:
+                symbol += 1
+            elif c.isupper():
+                upper += 1
+            elif c.islower():
+                lower += 1
+            elif c.isdigit():
+                digit += 1
+        self.length = len(password)
+        self.upper_count = upper
+        self.lower_count = lower
+        self.digit_count = digit
+        self.symbol_count = symbol
+
+    @classmethod
+    def from_counts(cls, length, upper, lower, digit, symbol):
+        features = cls.__new__(cls)
+        features.length = length
+        features.upper_count = upper
+        features.lower_count = lower
+        features.digit_count = digit
+        features.symbol_count = symbol
+        return features
+
+    @property
+    def has_upper(self):
+        return self.upper_count > 0
+
+    @property
+    def has_lower(self):
+        return self.lower_count > 0
+
+    @property
+    def has_digit(self):
+        return self.digit_count > 0
+
+    def details(self):
+        return {
+            "Uppercase": self.has_upper,
+            "Lowercase": self.has_lower,
+            "Digits": self.has_digit,
+            "Symbols": self.symbol_count,
+            "Length": self.length,
+        }
+
+
+# ========================== BATCH CLASSIFICATION ==========================
+# NumPy is optional and only imported by the first batch call, so the web
+# server never pays for it at startup
+np = None
+_CLASS_TABLE = None
+
+
+def _load_numpy():
+    global np, _CLASS_TABLE
+    if _CLASS_TABLE is None:
+        try:
+            import numpy
+        except ImportError:  # batches fall back to the per-password path
+            _CLASS_TABLE = False
+            return None
+        # Byte -> character class for ASCII; non-ASCII passwords take the scalar path
+        table = numpy.zeros(256, dtype=numpy.uint8)
+        for code in range(128):
+            c = chr(code)
+            if c in SYMBOLS:
+                table[code] = SYMBOL
+            elif c.isupper():
+                table[code] = UPPER
+            elif c.islower():
+                table[code] = LOWER
+            elif c.isdigit():
+                table[code] = DIGIT
+        np, _CLASS_TABLE = numpy, table
+    return np if _CLASS_TABLE is not False else None
+
+
+def classify_batch(passwords):
+    passwords = list(passwords)
+    if _load_numpy() is None:
+        return [PasswordFeatures(password) for password in passwords]
+
+    results = [None] * len(passwords)
+    ascii_positions = []
+    for i, password in enumerate(passwords):
+        if password and password.isascii():
+            ascii_positions.append(i)
+        else:
+            results[i] = PasswordFeatures(password)
+    if not ascii_positions:
+        return results
+
+    encoded = [passwords[i].encode("ascii") for i in ascii_positions]
+    lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded))
+    classes = _CLASS_TABLE[np.frombuffer(b"".join(encoded), dtype=np.uint8)]
+    starts = np.zeros(len(encoded), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    # One reduceat per class counts every password at once
+    counts = np.stack([np.add.reduceat(classes == cls, starts, dtype=np.int64)
+                       for cls in (UPPER, LOWER, DIGIT, SYMBOL)], axis=1)
+    from_counts = PasswordFeatures.from_counts
+    for i, length, (upper, lower, digit, symbol) in zip(ascii_positions, lengths.tolist(), counts.tolist()):
+        results[i] = from_counts(length, upper, lower, digit, symbol)
+    return results
@@ -0,0 +1,56 @@
+import gc, os, shutil, tempfile
+
+# ========================== GUNICORN ==========================
+# gunicorn -c gunicorn.conf.py server:app
+# The app is imported once in the master, which opens the breach index and
+# bloom filter before forking. Both are read-only mmaps, so every worker
+# shares the same page-cache pages and adding workers adds no index memory.
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("PASSMIMI_WEB_WORKERS", (os.cpu_count() or 1) * 2 + 1))
+preload_app = True
+# Workers write their metrics here and GET /metrics sums the directory. This
+# file runs before the app is imported, so config.py picks the value up.
+_own_metrics_dir = "PASSMIMI_METRICS_DIR" not in os.environ
+os.environ.setdefault("PASSMIMI_METRICS_DIR",
+                      os.path.join(tempfile.gettempdir(), f"passmimi-metrics-{os.getpid()}"))
+
+
+def on_starting(server):
+    # Counters restart with the pool; drop files left by an earlier master
+    metrics_dir = os.environ["PASSMIMI_METRICS_DIR"]
+    os.makedirs(metrics_dir, exist_ok=True)
+    for name in os.listdir(metrics_dir):
+        if name.endswith((".json", ".tmp")):
+            os.unlink(os.path.join(metrics_dir, name))
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["PASSMIMI_METRICS_DIR"], ignore_errors=True)
+
+
+def when_ready(server):
+    import evaluation
+    index, bloom = evaluation.get_index(), evaluation.get_filter()
+    server.log.info("Breach index %s, bloom filter %s",
+                    f"{len(index)} entries" if index is not None else "not built",
+                    f"{bloom.size_bytes} bytes" if bloom is not None else "not built")
+    # Compiled once here so workers start with the lists instead of each compiling them
+    import banned_lists
+    banned = banned_lists.get_banned()
+    server.log.info("Banned lists: %d entries in %d lists from %s", len(banned.exact), len(banned.lists),
+                    banned_lists.BANNED_DIR)
+
+
+def pre_fork(server, worker):
+    # Move everything the master allocated out of the collector's reach so
+    # workers do not copy those pages just by running a GC pass
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    import process_memory
+    usage = process_memory.memory_usage()
+    if usage is not None:
+        worker.log.info("Worker %s memory: rss %.1f MiB, unique %.1f MiB, shared %.1f MiB", worker.pid,
+                        usage["rss"] / 2**20, usage["unique"] / 2**20, usage["shared"] / 2**20)
@@ -0,0 +1,255 @@
+import json, os, threading, time
+from bisect import bisect_left
+from collections import deque
+
+from config import METRICS_DIR, METRICS_FLUSH_INTERVAL
+
+# ========================== PIPELINE METRICS ==========================
+# Counters and latency histograms for /check, exposed as Prometheus text on
+# GET /metrics. Recording only appends to a queue, which is atomic, so the
+# request path takes no lock; queued values are folded into their series
+# when read and every PENDING_LIMIT observations. Every process keeps its own
+# values. With METRICS_DIR set, a background thread also writes them to
+# "<dir>/<pid>.json" when they changed, at most once per
+# METRICS_FLUSH_INTERVAL, and a scrape sums every file there, so whichever
+# gunicorn worker answers reports the whole pool. Files of exited workers are
+# kept so counters never go backwards; gunicorn.conf.py empties the
+# directory when the master starts.
+CHECK_STAGE_SECONDS = "passmimi_check_stage_seconds"
+WORDLIST_STAGE_SECONDS = "passmimi_wordlist_stage_seconds"
+SCAN_FILE_SECONDS = "passmimi_scan_file_seconds"
+SCAN_BYTES = "passmimi_scan_bytes_total"
+LOOKUPS = "passmimi_lookups_total"
+FILTER_FALSE_POSITIVES = "passmimi_filter_false_positives_total"
+BANNED_RELOAD_SECONDS = "passmimi_banned_reload_seconds"
+
+_DESCRIPTIONS = {
+    CHECK_STAGE_SECONDS: ("histogram", "Time spent in each stage of a password check. "
+                                       "The wordlist and normalized stages are part of evaluate."),
+    WORDLIST_STAGE_SECONDS: ("histogram", "Time spent in each step of the breached-wordlist lookup."),
+    SCAN_FILE_SECONDS: ("histogram", "Time spent scanning each wordlist file when no index is built."),
+    SCAN_BYTES: ("counter", "On-disk bytes of each wordlist file read by the scan when no index is built."),
+    LOOKUPS: ("counter", "Result cache, bloom filter, index and banned-list lookups by outcome."),
+    FILTER_FALSE_POSITIVES: ("counter", "Bloom filter positives the index or scan did not confirm."),
+    BANNED_RELOAD_SECONDS: ("histogram", "Time to compile and swap in the custom banned lists after they changed."),
+}
+
+# Seconds; spans a cached check (microseconds) to a cold wordlist scan
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PENDING_LIMIT = 4096
+
+
+class Metrics:
+    def __init__(self, directory=METRICS_DIR, flush_interval=METRICS_FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        # (name, labels) -> values. A counter holds [total]; a histogram holds
+        # a count per bucket, one for +Inf, then the sum. Callers keep the
+        # lists they get, so a reset zeroes them in place.
+        self._counters = {}
+        self._histograms = {}
+        self._reset()
+        # A forked worker starts from zero with its own lock and flusher
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._pending = deque()
+        for values in self._counters.values():
+            values[0] = 0
+        for values in self._histograms.values():
+            values[:] = _empty_histogram()
+        self._dirty = False
+        self._flusher = None
+
+    # ---------- recording ----------
+    def counter(self, name, labels=()):
+        with self._lock:
+            return self._counters.setdefault((name, labels), [0])
+
+    def histogram(self, name, labels=()):
+        with self._lock:
+            return self._histograms.setdefault((name, labels), _empty_histogram())
+
+    def record(self, values, value):
+        # Adds to a counter or observes a histogram, whichever `values` is
+        pending = self._pending
+        pending.append((values, value))
+        if len(pending) > PENDING_LIMIT:
+            with self._lock:
+                self._fold()
+        if not self._dirty:
+            self._changed()
+
+    def _fold(self):
+        # Caller holds the lock; other threads may still be appending
+        pending = self._pending
+        while pending:
+            values, value = pending.popleft()
+            if len(values) == 1:
+                values[0] += value
+            else:
+                values[bisect_left(LATENCY_BUCKETS, value)] += 1
+                values[-1] += value
+
+    def _changed(self):
+        self._dirty = True
+        if self._flusher is None and self.directory:
+            with self._lock:
+                if self._flusher is not None:
+                    return
+                self._flusher = threading.Thread(target=self._flush_loop, name="passmimi-metrics", daemon=True)
+            self._flusher.start()
+
+    # ---------- sharing between processes ----------
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+    def snapshot(self):
+        with self._lock:
+            self._dirty = False
+            self._fold()
+            return {"counters": [[name, labels, values[0]] for (name, labels), values in self._counters.items()],
+                    "histograms": [[name, labels, list(values)] for (name, labels), values in self._histograms.items()]}
+
+    def flush(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(path + ".tmp", path)
+
+    def collect(self):
+        # Snapshots of every process sharing the directory, or this one alone
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue  # A worker's file being replaced; it is counted on the next scrape
+        return snapshots
+
+    # ---------- exposition ----------
+    def render(self):
+        counters, histograms = {}, {}
+        for snapshot in self.collect():
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, values in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                total = histograms.get(key)
+                histograms[key] = values if total is None else [a + b for a, b in zip(total, values)]
+
+        lines = []
+        for name, (kind, description) in _DESCRIPTIONS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), values):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else f"{bound:g}"
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {values[-1]!r}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _empty_histogram():
+    return [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+registry = Metrics()
+
+
+# ========================== PIPELINE HELPERS ==========================
+# The series behind each stage and lookup outcome are fetched from the
+# registry once and kept here, so recording costs a dict hit and an append.
+# Bulk audits set `enabled` to False: nothing scrapes them.
+enabled = True
+_check_stages, _wordlist_stages, _lookups, _files = {}, {}, {}, {}
+_unlabeled = {}  # metric name -> its only series
+
+
+def _series(cache, key, create, name, labels):
+    values = cache[key] = create(name, labels)
+    return values
+
+
+def check_stage(stage, started):
+    # Records the time since `started`, a time.perf_counter() value
+    if enabled:
+        values = (_check_stages.get(stage)
+                  or _series(_check_stages, stage, registry.histogram, CHECK_STAGE_SECONDS, (("stage", stage),)))
+        registry.record(values, time.perf_counter() - started)
+
+
+def wordlist_stage(stage, started):
+    if enabled:
+        values = (_wordlist_stages.get(stage)
+                  or _series(_wordlist_stages, stage, registry.histogram, WORDLIST_STAGE_SECONDS, (("stage", stage),)))
+        registry.record(values, time.perf_counter() - started)
+
+
+def lookup(source, result):
+    if enabled:
+        key = (source, result)
+        values = _lookups.get(key) or _series(_lookups, key, registry.counter, LOOKUPS,
+                                              (("source", source), ("result", result)))
+        registry.record(values, 1)
+
+
+def filter_false_positive():
+    if enabled:
+        values = (_unlabeled.get(FILTER_FALSE_POSITIVES)
+                  or _series(_unlabeled, FILTER_FALSE_POSITIVES, registry.counter, FILTER_FALSE_POSITIVES, ()))
+        registry.record(values, 1)
+
+
+def banned_reload(started):
+    if enabled:
+        values = (_unlabeled.get(BANNED_RELOAD_SECONDS)
+                  or _series(_unlabeled, BANNED_RELOAD_SECONDS, registry.histogram, BANNED_RELOAD_SECONDS, ()))
+        registry.record(values, time.perf_counter() - started)
+
+
+def file_scanned(label, scanned_bytes, seconds):
+    if enabled:
+        series = _files.get(label)
+        if series is None:
+            labels = (("file", label),)
+            series = _files[label] = (registry.histogram(SCAN_FILE_SECONDS, labels),
+                                      registry.counter(SCAN_BYTES, labels))
+        registry.record(series[0], seconds)
+        registry.record(series[1], scanned_bytes)
+
+
+def render():
+    return registry.render()
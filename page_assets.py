@@ -0,0 +1,66 @@
+import gzip, hashlib, re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ========================== PAGE ASSETS ==========================
+# The page is rendered once; its inline <style> and <script> blocks are moved
+# into content-addressed assets (/assets/app.<hash>.css) that browsers may
+# cache forever, and every body is compressed up front. Serving a page view is
+# then a dictionary lookup plus, for repeat visits, an ETag comparison.
+_BLOCKS = (
+    ("css", "text/css", re.compile(r"<style>(.*?)</style>", re.S), '<link rel="stylesheet" href="{}">'),
+    ("js", "application/javascript", re.compile(r"<script>(.*?)</script>", re.S), '<script src="{}"></script>'),
+)
+_MIN_COMPRESS = 256
+
+
+class Asset:
+    def __init__(self, body, mimetype):
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.encodings = {"identity": body}
+        if len(body) >= _MIN_COMPRESS:
+            self.encodings["gzip"] = gzip.compress(body, 9, mtime=0)
+            if brotli is not None:
+                self.encodings["br"] = brotli.compress(body, quality=11)
+
+    def select(self, accept_encoding):
+        # Smallest encoding the client accepts
+        offered = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+        best = "identity"
+        for name in ("gzip", "br"):
+            if name in offered and name in self.encodings \
+                    and len(self.encodings[name]) < len(self.encodings[best]):
+                best = name
+        return best, self.encodings[best]
+
+
+def build_assets(html, asset_url):
+    # Returns (page, {filename: Asset}); asset_url maps a filename to its URL
+    assets = {}
+    for ext, mimetype, pattern, tag in _BLOCKS:
+        def extract(match):
+            asset = Asset(match.group(1).strip().encode("utf-8"), mimetype)
+            name = f"app.{asset.etag}.{ext}"
+            assets[name] = asset
+            return tag.format(asset_url(name))
+        html = pattern.sub(extract, html)
+    return Asset(html.encode("utf-8"), "text/html"), assets
+
+
+def send_asset(asset, request, response_class, immutable=False):
+    encoding, body = asset.select(request.headers.get("Accept-Encoding", ""))
+    response = response_class(body, mimetype=asset.mimetype)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    # One ETag per encoding, since the bytes differ
+    response.set_etag(asset.etag if encoding == "identity" else f"{asset.etag}-{encoding}")
+    if immutable:
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
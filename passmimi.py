@@ -0,0 +1,191 @@
+import argparse, csv, json, os, sys, time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from config import AUDIT_CHUNK_SIZE, AUDIT_QUEUE_DEPTH
+from evaluation import analyze_password
+from features import classify_batch
+import metrics
+
+# ========================== BULK AUDIT ==========================
+# Reads a password dump in chunks, evaluates the chunks across a process pool
+# and writes results in input order. Only a few chunks per worker are ever in
+# flight, so memory stays flat however large the dump is. Plaintext passwords
+# are only written out with --include-password.
+FIELDS = ["line", "id", "rating", "strength", "crack_time", "breached", "found_in", "banned_in"]
+
+
+def _decode(raw):
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def iter_chunks(stream, chunk_size, delimiter=None, field=0, id_field=None):
+    chunk = []
+    for line_no, raw in enumerate(stream, 1):
+        line = _decode(raw.rstrip(b"\r\n"))
+        if not line:
+            continue
+        identifier = None
+        if delimiter is not None:
+            parts = line.split(delimiter)
+            if field >= len(parts):
+                continue
+            if id_field is not None and id_field < len(parts):
+                identifier = parts[id_field]
+            line = parts[field]
+        chunk.append((line_no, identifier, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def audit_chunk(chunk, scan=False, include_password=False):
+    rows = []
+    batch_features = classify_batch(password for _, _, password in chunk)
+    for (line_no, identifier, password), features in zip(chunk, batch_features):
+        try:
+            result = analyze_password(password, scan, features)
+        except Exception as e:
+            # Recorded as an error row instead of losing the chunk and the run
+            row = [line_no, identifier, None, f"error: {type(e).__name__}", "", False, "", ""]
+            rows.append(row + [password] if include_password else row)
+            continue
+        found_in = result.get("found_in", [])
+        banned_in = result.get("banned", {}).get("lists", [])
+        row = [line_no, identifier, result["rating"], result["strength"], result["crack_time"],
+               bool(found_in), "|".join(found_in), "|".join(banned_in)]
+        if include_password:
+            row.append(password)
+        rows.append(row)
+    return rows
+
+
+def _iter_results(chunks, workers, scan, include_password):
+    if workers <= 1:
+        for chunk in chunks:
+            yield audit_chunk(chunk, scan, include_password)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(audit_chunk, chunk, scan, include_password))
+            if len(pending) >= workers * AUDIT_QUEUE_DEPTH:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _Writer:
+    def __init__(self, out, fmt, fields):
+        self.out, self.fmt, self.fields = out, fmt, fields
+        if fmt == "csv":
+            self._csv = csv.writer(out)
+            self._csv.writerow(fields)
+
+    def write_rows(self, rows):
+        if self.fmt == "csv":
+            self._csv.writerows(rows)
+        else:
+            self.out.writelines(json.dumps(dict(zip(self.fields, row))) + "\n" for row in rows)
+
+
+def audit(stream, out, fmt="csv", workers=None, chunk_size=AUDIT_CHUNK_SIZE, delimiter=None, field=0,
+          id_field=None, scan=False, include_password=False):
+    workers = workers or os.cpu_count() or 1
+    # Nothing scrapes an offline audit; forked workers inherit the switch
+    metrics.enabled = False
+    fields = FIELDS + (["password"] if include_password else [])
+    writer = _Writer(out, fmt, fields)
+    ratings, strengths = Counter(), Counter()
+    total = breached = banned = errors = 0
+    started = time.perf_counter()
+    chunks = iter_chunks(stream, chunk_size, delimiter, field, id_field)
+    for rows in _iter_results(chunks, workers, scan, include_password):
+        writer.write_rows(rows)
+        for row in rows:
+            if row[2] is None:
+                errors += 1
+                continue
+            ratings[row[2]] += 1
+            strengths[row[3]] += 1
+            breached += row[5]
+            banned += bool(row[7])
+        total += len(rows)
+    elapsed = time.perf_counter() - started
+    return {
+        "total": total,
+        "breached": breached,
+        "banned": banned,
+        "errors": errors,
+        "ratings": {str(rating): ratings[rating] for rating in sorted(ratings)},
+        "strengths": dict(strengths.most_common()),
+        "seconds": round(elapsed, 3),
+        "passwords_per_minute": int(total / elapsed * 60) if elapsed else 0,
+    }
+
+
+def print_histogram(summary, out=sys.stderr):
+    total = summary["total"] or 1
+    print(f"[INFO] Audited {summary['total']} passwords in {summary['seconds']}s "
+          f"({summary['passwords_per_minute']}/min), {summary['breached']} found in breach lists, "
+          f"{summary['banned']} on banned lists, {summary['errors']} failed", file=out)
+    for rating, count in summary["ratings"].items():
+        bar = "#" * max(1 if count else 0, round(count / total * 50))
+        print(f"  {rating:>2}/10  {count:>10}  {count / total:6.1%}  {bar}", file=out)
+
+
+# ========================== CLI ==========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="passmimi", description="PassMimi command line tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("audit", help="evaluate a file of passwords offline")
+    p.add_argument("input", help="password file, one per line, or - for stdin")
+    p.add_argument("-o", "--output", default="-", help="results file (default stdout)")
+    p.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv")
+    p.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    p.add_argument("--chunk-size", type=int, default=AUDIT_CHUNK_SIZE)
+    p.add_argument("-d", "--delimiter", help="split lines on this delimiter, e.g. ':' for user:password dumps")
+    p.add_argument("--field", type=int, default=0, help="password field when --delimiter is set")
+    p.add_argument("--id-field", type=int, help="field copied to the id column when --delimiter is set")
+    p.add_argument("--scan", action="store_true",
+                   help="scan raw wordlists when no index exists (very slow for large dumps)")
+    p.add_argument("--include-password", action="store_true", help="write plaintext passwords to the output")
+    p.add_argument("--summary", help="also write the rating histogram as JSON to this path")
+
+    for name, target in (("build-index", "build"), ("update-index", "update-index"),
+                         ("build-normalized", "build-normalized")):
+        p = sub.add_parser(name, help=f"wordlist_index.py {target}", add_help=False)
+        p.set_defaults(index_command=target)
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command != "audit":
+        import wordlist_index
+        return wordlist_index.main([args.index_command, *extra])
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    stream = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        summary = audit(stream, out, args.format, args.workers, args.chunk_size, args.delimiter,
+                        args.field, args.id_field, args.scan, args.include_password)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+    print_histogram(summary)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
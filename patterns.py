@@ -0,0 +1,282 @@
+import datetime, functools, math, re
+
+# ========================== STRUCTURAL PATTERNS ==========================
+# Finds the predictable pieces of a password (keyboard walks, sequences,
+# repeats, dates and years), the way zxcvbn does, and picks the cheapest
+# decomposition into those pieces plus brute-forced characters. Everything is
+# in log10 guesses. A brute-forced character costs log10 of the password's
+# character pool, so a password without patterns scores exactly the
+# character-class estimate and patterns can only lower it.
+MAX_LENGTH = 100  # Characters past this are brute-forced; patterns there change nothing
+MIN_WALK_LENGTH = 3
+MIN_SEQUENCE_LENGTH = 3
+MAX_SEQUENCE_DELTA = 5
+REFERENCE_YEAR = datetime.date.today().year
+MIN_YEAR_SPACE = 20
+_LOG10_FACTORIAL = [math.lgamma(n + 1) / math.log(10) for n in range(MAX_LENGTH + 2)]
+
+
+# ========================== KEYBOARD GRAPHS ==========================
+# Built once at import. Each key maps to {neighbour character: direction};
+# a shifted character shares its key's position. Rows of the slanted layout
+# are offset half a key, so key c in row r touches c and c+1 in the row above
+# and c-1 and c in the row below.
+_QWERTY = (
+    ("`~", "1!", "2@", "3#", "4$", "5%", "6^", "7&", "8*", "9(", "0)", "-_", "=+"),
+    ("qQ", "wW", "eE", "rR", "tT", "yY", "uU", "iI", "oO", "pP", "[{", "]}", "\\|"),
+    ("aA", "sS", "dD", "fF", "gG", "hH", "jJ", "kK", "lL", ";:", "'\""),
+    ("zZ", "xX", "cC", "vV", "bB", "nN", "mM", ",<", ".>", "/?"),
+)
+_SLANTED = ((0, -1), (0, 1), (-1, 0), (-1, 1), (1, -1), (1, 0))
+# The keypad is a plain grid, so all eight neighbours count
+_KEYPAD = (
+    (None, "/", "*", "-"),
+    ("7", "8", "9", "+"),
+    ("4", "5", "6", None),
+    ("1", "2", "3", None),
+    (None, "0", ".", None),
+)
+_ALIGNED = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def _build_graph(rows, directions):
+    positions = {}
+    for r, row in enumerate(rows):
+        for c, key in enumerate(row):
+            if key is not None:
+                positions[(r, c)] = key
+    graph, shifted = {}, set()
+    for (r, c), key in positions.items():
+        neighbours = {}
+        for direction, (dr, dc) in enumerate(directions):
+            other = positions.get((r + dr, c + dc))
+            if other is not None:
+                for char in other:
+                    neighbours[char] = direction
+        for i, char in enumerate(key):
+            graph[char] = neighbours
+            if i:
+                shifted.add(char)
+    keys = len(positions)
+    average_degree = sum(len(graph[key[0]]) / len(key) for key in positions.values()) / keys
+    return graph, shifted, keys, average_degree
+
+
+_GRAPHS = (_build_graph(_QWERTY, _SLANTED), _build_graph(_KEYPAD, _ALIGNED))
+
+
+@functools.lru_cache(maxsize=4096)
+def _log10_walk_guesses(length, turns, shifted, unshifted, keys, degree):
+    # zxcvbn's spatial estimate: every start key, every way of placing the turns
+    guesses = 0.0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * keys * degree ** j
+    if shifted:
+        if not unshifted:
+            guesses *= 2
+        else:
+            guesses *= sum(math.comb(shifted + unshifted, i) for i in range(1, min(shifted, unshifted) + 1))
+    return math.log10(guesses)
+
+
+_NO_NEIGHBOURS = {}
+
+
+def keyboard_walks(password, pairs):
+    # pairs: consecutive (character, next character) of the password
+    matches = []
+    for graph, shifted_chars, keys, degree in _GRAPHS:
+        steps = [graph.get(a, _NO_NEIGHBOURS).get(b) for a, b in pairs]
+        i, n = 0, len(steps)
+        while i < n:
+            if steps[i] is None:
+                i += 1
+                continue
+            j = i + 1
+            while j < n and steps[j] is not None:
+                j += 1
+            # Steps i..j-1 walk over characters i..j
+            if j - i + 1 >= MIN_WALK_LENGTH:
+                turns = 1 + sum(steps[k] != steps[k - 1] for k in range(i + 1, j))
+                shifted = sum(c in shifted_chars for c in password[i:j + 1])
+                guesses = _log10_walk_guesses(j - i + 1, turns, shifted, j - i + 1 - shifted, keys, degree)
+                matches.append(("keyboard_walk", i, j + 1, guesses))
+            i = j
+    return matches
+
+
+# ========================== SEQUENCES AND REPEATS ==========================
+_SEQUENCE_CLASS = {**dict.fromkeys("abcdefghijklmnopqrstuvwxyz", 1),
+                   **dict.fromkeys("ABCDEFGHIJKLMNOPQRSTUVWXYZ", 2), **dict.fromkeys("0123456789", 3)}
+
+
+def sequences(password, pairs):
+    # Runs with a constant step of at most MAX_SEQUENCE_DELTA: "abc", "2468", "zyx"
+    matches = []
+    deltas = [ord(b) - ord(a) for a, b in pairs]
+    i, n = 0, len(deltas)
+    while i < n:
+        delta = deltas[i]
+        kind = _SEQUENCE_CLASS.get(password[i])
+        if not kind or delta == 0 or abs(delta) > MAX_SEQUENCE_DELTA:
+            i += 1
+            continue
+        j = i
+        while j < n and deltas[j] == delta and _SEQUENCE_CLASS.get(password[j + 1]) == kind:
+            j += 1
+        # Characters i..j
+        if j - i + 1 >= MIN_SEQUENCE_LENGTH:
+            base = 4 if password[i] in "aAzZ019" else 10 if kind == 3 else 26
+            matches.append(("sequence", i, j + 1, math.log10(base * (j - i + 1) * (1 if delta > 0 else 2))))
+            i = j
+        else:
+            i += 1
+    return matches
+
+
+_GREEDY_REPEAT = re.compile(r"(.+)\1+", re.S)
+_LAZY_REPEAT = re.compile(r"(.+?)\1+", re.S)
+
+
+def repeats(password, bruteforce_log10):
+    # "aaaa", "abcabc": the base costs what it would cost on its own, once per repeat
+    matches, position = [], 0
+    while position < len(password):
+        greedy = _GREEDY_REPEAT.search(password, position)
+        if greedy is None:
+            break
+        lazy = _LAZY_REPEAT.search(password, position)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            match, base = greedy, re.fullmatch(r"(.+?)\1+", greedy.group(0), re.S).group(1)
+        else:
+            match, base = lazy, lazy.group(1)
+        count = len(match.group(0)) // len(base)
+        base_guesses = minimum_guesses(base, bruteforce_log10)[0]
+        matches.append(("repeat", match.start(), match.end(), base_guesses + math.log10(count)))
+        position = match.end()
+    return matches
+
+
+# ========================== DATES AND YEARS ==========================
+_YEAR = re.compile(r"19[0-9][0-9]|20[0-9][0-9]")
+_DIGIT_RUN = re.compile(r"[0-9]{4,}")
+_DATE_SEPARATED = re.compile(r"([0-9]{1,4})([\s/\\_.-])([0-9]{1,2})\2([0-9]{1,4})")
+# Where to cut a run of digits into day, month and year
+_DATE_SPLITS = {4: ((1, 2), (2, 3)), 5: ((1, 3), (2, 3)), 6: ((1, 2), (2, 4), (4, 5)),
+                7: ((1, 3), (2, 3), (4, 5), (4, 6)), 8: ((2, 4), (4, 6))}
+
+
+def _year_space(year):
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+
+def _date_year(parts):
+    # The year of a valid (day, month, year) reading in any common order, or None
+    for year, first, second in ((parts[2], parts[0], parts[1]), (parts[0], parts[1], parts[2])):
+        if year < 100:
+            year += 1900 if year > 50 else 2000
+        elif not 1000 <= year <= 2050:
+            continue
+        for day, month in ((first, second), (second, first)):
+            if 1 <= month <= 12 and 1 <= day <= 31:
+                return year
+    return None
+
+
+def dates(password):
+    matches = []
+    for match in _YEAR.finditer(password):
+        matches.append(("year", match.start(), match.end(), math.log10(_year_space(int(match.group(0))))))
+    for match in _DATE_SEPARATED.finditer(password):
+        year = _date_year((int(match.group(1)), int(match.group(3)), int(match.group(4))))
+        if year is not None:
+            matches.append(("date", match.start(), match.end(), math.log10(365 * _year_space(year) * 4)))
+    for run in _DIGIT_RUN.finditer(password):
+        for i in range(run.start(), run.end() - 3):
+            for length in range(4, min(8, run.end() - i) + 1):
+                guesses = _log10_digit_date(password[i:i + length])
+                if guesses is not None:
+                    matches.append(("date", i, i + length, guesses))
+    return matches
+
+
+@functools.lru_cache(maxsize=4096)
+def _log10_digit_date(token):
+    # "13041987", "870413": every way of cutting the digits into a date
+    years = [_date_year((int(token[:a]), int(token[a:b]), int(token[b:]))) for a, b in _DATE_SPLITS[len(token)]]
+    years = [year for year in years if year is not None]
+    if not years:
+        return None
+    return math.log10(365 * min(_year_space(year) for year in years))
+
+
+# ========================== MINIMUM-GUESS DECOMPOSITION ==========================
+def find_patterns(password, bruteforce_log10):
+    pairs = list(zip(password, password[1:]))
+    return (keyboard_walks(password, pairs) + sequences(password, pairs) + repeats(password, bruteforce_log10)
+            + dates(password))
+
+
+def minimum_guesses(password, bruteforce_log10):
+    # Dynamic programming over prefixes. For every end position keep the best
+    # decomposition ending in brute force and the best ending in a pattern; a
+    # sequence of l pieces also pays log10(l!) for the order they come in.
+    # Returns (log10 guesses, [(pattern, start, end, log10 guesses), ...]).
+    n = min(len(password), MAX_LENGTH)
+    tail = (len(password) - n) * bruteforce_log10
+    password = password[:n]
+    found = find_patterns(password, bruteforce_log10)
+    if not found:
+        return n * bruteforce_log10 + tail, []
+    ending = [[] for _ in range(n + 1)]
+    for match in found:
+        ending[match[2]].append(match)
+
+    # best_*[k] = (total, log10 guesses without the order term, pieces, back pointer)
+    factorial = _LOG10_FACTORIAL
+    best_brute = [None] * (n + 1)
+    best_match = [None] * (n + 1)
+    start = (0.0, 0.0, 0, None)
+    for k in range(1, n + 1):
+        brute = None
+        extend = best_brute[k - 1]
+        if extend is not None:
+            log = extend[1] + bruteforce_log10
+            brute = (log + factorial[extend[2]], log, extend[2], extend[3])
+        previous = start if k == 1 else best_match[k - 1]
+        if previous is not None:
+            log = previous[1] + bruteforce_log10
+            total = log + factorial[previous[2] + 1]
+            if brute is None or total < brute[0]:
+                brute = (total, log, previous[2] + 1, ("brute", previous))
+        best_brute[k] = brute
+
+        best = None
+        for match in ending[k]:
+            i = match[1]
+            for previous in ((start,) if i == 0 else (best_brute[i], best_match[i])):
+                if previous is not None:
+                    log = previous[1] + match[3]
+                    total = log + factorial[previous[2] + 1]
+                    if best is None or total < best[0]:
+                        best = (total, log, previous[2] + 1, (match, previous))
+        best_match[k] = best
+
+    best = best_brute[n]
+    if best_match[n] is not None and best_match[n][0] < best[0]:
+        best = best_match[n]
+    return best[0] + tail, _used_patterns(best[3])
+
+
+def _used_patterns(link):
+    used = []
+    while link is not None:
+        if link[0] == "brute":
+            link = link[1][3]
+            continue
+        match, previous = link
+        used.append(match)
+        link = previous[3]
+    used.reverse()
+    return used
@@ -1,24 +1,180 @@
-import os
+import argparse, hashlib, os, shutil, sys, time, zipfile
+
 import requests
-import zipfile
-from io import BytesIO
 
-# Dropbox direct download link (use dl=1)
-WORDLIST_URL = "https://www.dropbox.com/scl/fi/8bxum1rn8j2iw97i44izk/wordlists.zip?rlkey=kxijb72ndw90pkkn30nrcrroh&st=pmwi2iji&dl=1"
-DEST_DIR = "wordlists"
+from config import WORDLIST_URL, WORDLIST_SHA256, WORDLIST_DIR, WORDLIST_PATHS, DOWNLOAD_RETRIES, INDEX_PATH, MANIFEST_PATH
+from wordlist_index import IndexBuilder, codec_suffix, iter_source_labels, source_label, strip_codec_suffix
+
+DEST_DIR = WORDLIST_DIR
+BLOCK_SIZE = 1 << 20
+# Small enough that a dropped connection loses little of what was received
+DOWNLOAD_BLOCK_SIZE = 64 << 10
+
+# ========================== DOWNLOAD ==========================
+# The archive streams to "<archive>.part" and is renamed once complete. An
+# interrupted download, in this run or an earlier one, continues with an HTTP
+# Range request from the bytes already on disk; servers that ignore Range
+# send the whole file again and we start over.
+def _hash_file(path, hasher):
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            hasher.update(block)
+
+
+def download(url, archive_path, sha256="", retries=DOWNLOAD_RETRIES, session=None):
+    session = session or requests.Session()
+    part_path = f"{archive_path}.part"
+    hasher = hashlib.sha256()
+    if os.path.exists(part_path):
+        _hash_file(part_path, hasher)
+    for attempt in range(1, retries + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 416:
+                    break  # Nothing left past what we already have
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    print("[WARN] Server does not support resuming; downloading from the start")
+                    offset, hasher = 0, hashlib.sha256()
+                if offset:
+                    print(f"[INFO] Resuming download at {offset / 2**20:.1f} MiB")
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for block in response.iter_content(DOWNLOAD_BLOCK_SIZE):
+                        f.write(block)
+                        hasher.update(block)
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == retries:
+                raise
+            print(f"[WARN] Download interrupted ({e.__class__.__name__}); retrying ({attempt}/{retries - 1})")
+            time.sleep(min(2 ** attempt, 30))
+
+    digest = hasher.hexdigest()
+    if sha256 and digest != sha256.lower():
+        os.unlink(part_path)
+        raise ValueError(f"checksum mismatch for {url}: expected {sha256}, got {digest}")
+    if not sha256:
+        print(f"[WARN] No checksum configured; downloaded archive has SHA-256 {digest}")
+    os.replace(part_path, archive_path)
+    return digest
+
+
+# ========================== EXTRACT AND INDEX ==========================
+# Entries are copied to disk block by block, never held whole in memory. Lines
+# of entries that belong to a configured wordlist source are hashed into the
+# index builder in the same pass, so no file is read twice.
+def _member_path(dest_dir, name):
+    # Refuse absolute paths and "..", as zipfile.extractall does
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+    if not parts or ".." in parts or ":" in parts[0]:
+        return None
+    return os.path.join(dest_dir, *parts)
+
+
+def _source_label(file_path, sources):
+    for source in sources:
+        source = os.path.normpath(source)
+        if strip_codec_suffix(file_path) == source or file_path.startswith(source + os.sep):
+            return source_label(source, file_path)
+    return None
 
-def download_and_extract():
+
+def _copy_lines(src, dst, hasher):
+    # Write every block through and yield its stripped, non-empty lines, the
+    # same lines wordlist_index.iter_lines would read back from the file
+    carry = b""
+    for block in iter(lambda: src.read(BLOCK_SIZE), b""):
+        dst.write(block)
+        hasher.update(block)
+        lines = (carry + block).split(b"\n")
+        carry = lines.pop()
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if line:
+                yield line
+    carry = carry.rstrip(b"\r")
+    if carry:
+        yield carry
+
+
+def extract(archive_path, dest_dir=DEST_DIR, builder=None, sources=WORDLIST_PATHS):
+    extracted = 0
+    with zipfile.ZipFile(archive_path) as archive:
+        for member in archive.infolist():
+            target = _member_path(dest_dir, member.filename)
+            if target is None:
+                print(f"[WARN] Skipping unsafe archive entry: {member.filename}")
+                continue
+            if member.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            label = _source_label(os.path.normpath(target), sources) if builder is not None else None
+            # Compressed wordlists are stored as they are and indexed from disk
+            streamed = label is not None and not codec_suffix(target)
+            with archive.open(member) as src, open(target, "wb") as dst:
+                if streamed:
+                    hasher = hashlib.sha256()
+                    builder.add(label, _copy_lines(src, dst, hasher))
+                else:
+                    shutil.copyfileobj(src, dst, BLOCK_SIZE)
+            if streamed:
+                builder.record(label, os.stat(target), hasher.hexdigest())
+            elif label is not None:
+                builder.add_file(target, label)
+            extracted += 1
+    return extracted
+
+
+def download_and_extract(url=WORDLIST_URL, sha256=WORDLIST_SHA256, dest_dir=DEST_DIR, build_index=True,
+                         sources=WORDLIST_PATHS, index_path=INDEX_PATH, manifest_path=MANIFEST_PATH):
     print("[INFO] Downloading wordlists from cloud...")
-    os.makedirs(DEST_DIR, exist_ok=True)
-    
-    response = requests.get(WORDLIST_URL, stream=True)
-    response.raise_for_status()
+    os.makedirs(dest_dir, exist_ok=True)
+    archive_path = os.path.join(dest_dir, "wordlists.zip")
+    if os.path.exists(archive_path):
+        # Left behind by a run that failed after the download was verified
+        print(f"[INFO] Reusing downloaded archive {archive_path}")
+    else:
+        download(url, archive_path, sha256)
+
+    builder = IndexBuilder(index_path, manifest_path=manifest_path) if build_index else None
+    try:
+        extracted = extract(archive_path, dest_dir, builder, sources)
+    except BaseException:
+        if builder is not None:
+            builder.close()
+        raise
+    os.unlink(archive_path)
+    print(f"[INFO] {extracted} wordlist files successfully extracted to: {dest_dir}")
+
+    if builder is not None:
+        # Number the sources the way build_index would, in WORDLIST_PATHS order
+        order = [label for _, label in iter_source_labels(sources) if label in builder.files]
+        count = builder.finish(order)
+        print(f"[INFO] Indexed {count} unique passwords from {len(order)} files -> {index_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download, verify, extract and index the PassMimi wordlists.")
+    parser.add_argument("--url", default=WORDLIST_URL)
+    parser.add_argument("--sha256", default=WORDLIST_SHA256, help="expected SHA-256 of the archive")
+    parser.add_argument("--dest", default=DEST_DIR)
+    parser.add_argument("--no-index", action="store_true", help="only extract; build the index later")
+    parser.add_argument("--index", default=INDEX_PATH)
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    args = parser.parse_args(argv)
+
+    # The configured sources, relocated when extracting somewhere else
+    sources = [os.path.join(args.dest, os.path.relpath(path, DEST_DIR)) for path in WORDLIST_PATHS]
+    try:
+        download_and_extract(args.url, args.sha256, args.dest, not args.no_index, sources, args.index, args.manifest)
+    except (requests.RequestException, ValueError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] {e}")
+        return 1
+    return 0
 
-    # Save to memory
-    with zipfile.ZipFile(BytesIO(response.content)) as zip_ref:
-        zip_ref.extractall(DEST_DIR)
-    
-    print("[INFO] Wordlists successfully extracted to:", DEST_DIR)
 
 if __name__ == "__main__":
-    download_and_extract()
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import argparse, os, sys
+
+# ========================== PROCESS MEMORY ==========================
+# Reads Linux /proc accounting for a process. "unique" (USS) is memory only
+# that process holds and would be freed if it exited. Shared pages, such as the
+# breach index mapped by the master before fork, appear in "shared" and count
+# once in total usage however many workers there are.
+_FIELDS = {
+    "Rss": "rss", "Pss": "pss", "Shared_Clean": "shared_clean", "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean", "Private_Dirty": "private_dirty",
+}
+
+
+def memory_usage(pid="self"):
+    usage = dict.fromkeys(_FIELDS.values(), 0)
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in _FIELDS:
+                    usage[_FIELDS[name]] += int(value.split()[0]) * 1024
+    except OSError:
+        return None
+    usage["unique"] = usage["private_clean"] + usage["private_dirty"]
+    usage["shared"] = usage["shared_clean"] + usage["shared_dirty"]
+    usage["pid"] = os.getpid() if pid == "self" else int(pid)
+    return usage
+
+
+def child_pids(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", "r") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def pool_report(master_pid):
+    report = (memory_usage(pid) for pid in [master_pid, *child_pids(master_pid)])
+    return [usage for usage in report if usage is not None]
+
+
+def format_mib(value):
+    return f"{value / 2**20:8.1f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-process memory of a gunicorn master and its workers.")
+    parser.add_argument("pid", type=int, help="gunicorn master pid")
+    args = parser.parse_args(argv)
+
+    report = pool_report(args.pid)
+    if not report:
+        print(f"[WARN] No /proc memory information for pid {args.pid}")
+        return 1
+    print(f"{'pid':>8} {'role':>7} {'rss MiB':>8} {'pss MiB':>8} {'unique':>8} {'shared':>8}")
+    for usage in report:
+        role = "master" if usage["pid"] == args.pid else "worker"
+        print(f"{usage['pid']:>8} {role:>7} {format_mib(usage['rss'])} {format_mib(usage['pss'])} "
+              f"{format_mib(usage['unique'])} {format_mib(usage['shared'])}")
+    total = sum(usage["pss"] for usage in report)
+    print(f"[INFO] Total proportional memory (PSS) for the pool: {total / 2**20:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import itertools, os, random, sys, threading, time
+from collections import Counter
+
+from config import PROFILE_RATE, PROFILE_INTERVAL, PROFILE_DIR
+
+# ========================== REQUEST PROFILING ==========================
+# Opt-in statistical profiler for /check and /check/batch. A sampled request
+# opens a Session, and the threads working on it register while they run.
+# One sampler thread per process reads their stacks with
+# sys._current_frames() every PROFILE_INTERVAL seconds. When the request
+# ends, the counts are written to PROFILE_DIR in collapsed-stack format,
+# which flamegraph.pl, speedscope and similar tools read. Only code object
+# names are read from frames, never local variables, so a profile cannot
+# contain the password. When the rate is 0, maybe_start is one comparison
+# and no thread exists. Requests shorter than one interval usually record
+# no samples, and those write no file. The sampler needs the GIL to look, so
+# code that releases it (file I/O, sleeps) is sampled more readily than a
+# tight Python loop; use an external profiler such as py-spy for exact CPU
+# attribution.
+rate = PROFILE_RATE
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_sessions = set()
+_sampler = None
+_names = {}
+_sequence = itertools.count(1)
+written = 0
+
+
+class Session:
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.threads = set()
+        self.stacks = Counter()
+
+    def run(self, fn, *args):
+        # Calls fn(*args) with the current thread sampled for this session
+        ident = threading.get_ident()
+        self.threads.add(ident)
+        try:
+            return fn(*args)
+        finally:
+            self.threads.discard(ident)
+
+    def finish(self):
+        global written
+        with _lock:
+            _sessions.discard(self)
+        if not self.stacks:
+            return None
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        name = (f"{self.kind}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}"
+                f"-{elapsed_ms:.0f}ms.folded")
+        path = os.path.join(PROFILE_DIR, name)
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        except OSError as e:
+            print(f"[WARN] Could not write profile {path}: {e}")
+            return None
+        written += 1
+        return path
+
+
+def maybe_start(kind):
+    # A Session for a sampled request, or None for the rest
+    global _sampler
+    if not rate or random.random() >= rate:
+        return None
+    session = Session(kind)
+    with _lock:
+        _sessions.add(session)
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sample_loop, name="passmimi-profiler", daemon=True)
+            _sampler.start()
+        _wake.set()
+    return session
+
+
+def set_rate(value):
+    global rate
+    rate = value
+
+
+def status():
+    return {"pid": os.getpid(), "rate": rate, "interval": PROFILE_INTERVAL, "directory": PROFILE_DIR,
+            "active": len(_sessions), "written": written}
+
+
+# ========================== SAMPLING ==========================
+def _frame_name(code):
+    name = _names.get(code)
+    if name is None:
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        name = _names[code] = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+    return name
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def _sample_loop():
+    while True:
+        _wake.wait()
+        with _lock:
+            active = list(_sessions)
+            if not active:
+                _wake.clear()
+                continue
+        frames = sys._current_frames()
+        for session in active:
+            for ident in tuple(session.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    session.stacks[_collapse(frame)] += 1
+        del frames
+        time.sleep(PROFILE_INTERVAL)
+
+
+def _after_fork():
+    # The sampler thread does not survive a fork; the child starts its own
+    global _lock, _wake, _sampler
+    _lock, _wake = threading.Lock(), threading.Event()
+    _sessions.clear()
+    _sampler = None
+
+
+os.register_at_fork(after_in_child=_after_fork)
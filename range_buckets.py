@@ -0,0 +1,130 @@
+import argparse, hashlib, itertools, mmap, os, struct, sys, tempfile, time
+
+from config import WORDLIST_PATHS, INDEX_PATH, RANGE_DIR
+import wordlist_index
+
+# ========================== HASH-PREFIX BUCKETS ==========================
+# k-anonymity lookups in the style of Have I Been Pwned: a client sends the
+# first 5 hex characters of a password's SHA-1 and gets back every indexed
+# hash in that bucket as "SUFFIX:COUNT" lines, where COUNT is the number of
+# wordlists containing it. The password itself never leaves the client.
+#
+# The 16^5 buckets are precomputed from the sorted index into 256 shard files
+# named after the first two hex characters. A shard is a header, a table of
+# (body offset, ETag) for its 4096 buckets plus an end offset, then the
+# response bodies back to back, so serving a bucket is one mmap slice.
+MAGIC = b"PMRNG\x00"
+VERSION = 1
+PREFIX_LENGTH = 5
+SHARD_PREFIX_LENGTH = 2
+BUCKETS_PER_SHARD = 16 ** (PREFIX_LENGTH - SHARD_PREFIX_LENGTH)
+HEADER = struct.Struct("<6sHI")  # magic, version, buckets per shard
+HEADER_SIZE = 16
+ENTRY = struct.Struct("<Q8s")  # body offset, ETag bytes
+END = struct.Struct("<Q")
+TABLE_SIZE = BUCKETS_PER_SHARD * ENTRY.size + END.size
+
+
+def shard_path(range_dir, shard):
+    return os.path.join(range_dir, f"{shard:02X}.bin")
+
+
+def _write_shard(range_dir, shard, bodies):
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=range_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            offset = HEADER_SIZE + TABLE_SIZE
+            table = []
+            for body in bodies:
+                table.append(ENTRY.pack(offset, hashlib.sha1(body).digest()[:8]))
+                offset += len(body)
+            f.write(HEADER.pack(MAGIC, VERSION, BUCKETS_PER_SHARD).ljust(HEADER_SIZE, b"\x00"))
+            f.write(b"".join(table) + END.pack(offset))
+            f.writelines(bodies)
+        os.chmod(tmp_path, 0o644)
+        # Shards are swapped one by one; each is self-consistent and ETags are
+        # content hashes, so caches never pair a tag with the wrong body
+        os.replace(tmp_path, shard_path(range_dir, shard))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _iter_bodies(index):
+    # One response body per bucket, all 16^5 of them in prefix order
+    counts, lines, current = {}, [], 0
+    for digest, set_id in index.iter_records():
+        prefix = int.from_bytes(digest[:3], "big") >> (24 - 4 * PREFIX_LENGTH)
+        while current < prefix:
+            yield b"".join(lines)
+            lines, current = [], current + 1
+        if set_id not in counts:
+            counts[set_id] = len(index.labels_for(set_id))
+        lines.append(b"%s:%d\r\n" % (digest.hex().upper()[PREFIX_LENGTH:].encode(), counts[set_id]))
+    while current < 16 ** PREFIX_LENGTH:
+        yield b"".join(lines)
+        lines, current = [], current + 1
+
+
+def build_buckets(index_path=INDEX_PATH, range_dir=RANGE_DIR, sources=WORDLIST_PATHS):
+    index = wordlist_index.open_index(index_path)
+    if index is None:
+        wordlist_index.build_index(sources, index_path)
+        index = wordlist_index.open_index(index_path)
+    os.makedirs(range_dir, exist_ok=True)
+    try:
+        bodies = _iter_bodies(index)
+        for shard in range(16 ** SHARD_PREFIX_LENGTH):
+            _write_shard(range_dir, shard, list(itertools.islice(bodies, BUCKETS_PER_SHARD)))
+    finally:
+        index.close()
+    return index.count
+
+
+# ========================== SERVING ==========================
+class RangeShard:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, buckets = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION or buckets != BUCKETS_PER_SHARD:
+                raise ValueError(f"{path} is not a PassMimi range shard (version {VERSION})")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def bucket(self, index):
+        # (body, etag) for bucket `index` within this shard
+        offset, etag = ENTRY.unpack_from(self._mm, HEADER_SIZE + index * ENTRY.size)
+        end = END.unpack_from(self._mm, HEADER_SIZE + (index + 1) * ENTRY.size)[0]
+        return self._mm[offset:end], etag.hex()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+_HEX = frozenset("0123456789abcdefABCDEF")
+
+
+def parse_prefix(prefix):
+    # 5 hex characters, either case, as (shard, bucket within the shard); anything else is None
+    if len(prefix) != PREFIX_LENGTH or not _HEX.issuperset(prefix):
+        return None
+    return divmod(int(prefix, 16), BUCKETS_PER_SHARD)
+
+
+# ========================== CLI ==========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the sharded hash-prefix buckets behind GET /range/<prefix>.")
+    parser.add_argument("--index", default=INDEX_PATH)
+    parser.add_argument("--out", default=RANGE_DIR)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = build_buckets(args.index, args.out)
+    print(f"[INFO] Wrote {16 ** PREFIX_LENGTH} buckets ({count} hashes) in {16 ** SHARD_PREFIX_LENGTH} shards "
+          f"-> {args.out} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import hmac, json, os, sqlite3, threading, time
+from collections import OrderedDict
+
+from config import CACHE_SIZE, CACHE_TTL, CACHE_BACKEND, CACHE_PATH, CACHE_SHARED_SIZE, CACHE_SECRET
+
+# ========================== RESULT CACHE ==========================
+# Caches full /check results for repeated passwords. Entries are keyed by an
+# HMAC-SHA256 of the password under a secret that never leaves the process,
+# so neither memory nor the shared file holds a password or a plain hash of
+# one. Gunicorn workers forked from a preloaded master inherit the same
+# secret; otherwise set PASSMIMI_CACHE_SECRET so workers share SQLite hits.
+_SECRET = bytes.fromhex(CACHE_SECRET) if CACHE_SECRET else os.urandom(32)
+
+
+def cache_key(password):
+    return hmac.digest(_SECRET, password.encode("utf-8", errors="surrogatepass"), "sha256")
+
+
+class LRUCache:
+    def __init__(self, max_size=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SQLiteCache:
+    # Shared by every worker on the host; one connection per thread
+    def __init__(self, path=CACHE_PATH, max_size=CACHE_SHARED_SIZE, ttl=CACHE_TTL):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = self.misses = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = sqlite3.connect(path, timeout=5, isolation_level=None)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, value TEXT, expires REAL)")
+            db.execute("CREATE INDEX IF NOT EXISTS results_expires ON results (expires)")
+        finally:
+            db.close()
+
+    def _connect(self):
+        # SQLite connections must not cross a fork, so reconnect in each worker
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA synchronous=OFF")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def get(self, key):
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM results WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        try:
+            db = self._connect()
+            db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                       (key, json.dumps(value), time.time() + self.ttl))
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._prune(db)
+        except sqlite3.Error:
+            pass
+
+    def _prune(self, db):
+        db.execute("DELETE FROM results WHERE expires <= ?", (time.time(),))
+        db.execute("DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                   (self.max_size,))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM results")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        try:
+            size = self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ResultCache:
+    # In-process LRU in front of an optional shared backend
+    def __init__(self, local, shared=None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, password):
+        key = cache_key(password)
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        # Callers may add fields; never hand out the cached dict itself
+        return dict(value) if value is not None else None
+
+    def set(self, password, result):
+        key = cache_key(password)
+        self.local.set(key, result)
+        if self.shared is not None:
+            self.shared.set(key, result)
+
+    def stats(self):
+        stats = {"backend": "sqlite" if self.shared is not None else "memory", "local": self.local.stats()}
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+
+def create_cache(size=CACHE_SIZE, ttl=CACHE_TTL, backend=CACHE_BACKEND, path=CACHE_PATH,
+                 shared_size=CACHE_SHARED_SIZE):
+    if size <= 0:
+        return None
+    shared = SQLiteCache(path, shared_size, ttl) if backend == "sqlite" else None
+    return ResultCache(LRUCache(size, ttl), shared)
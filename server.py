@@ -0,0 +1,22 @@
+import argparse, os, sys
+
+from app import app
+
+# ========================== HEADLESS SERVER ==========================
+# Entry point for servers and containers: gunicorn server:app
+# Only the web stack is imported; pywebview is loaded by the desktop entry
+# point (app.py) alone, and the breach index, bloom filter and NumPy are
+# opened on first use.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run PassMimi without the desktop window.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 5000)))
+    args = parser.parse_args(argv)
+    app.run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
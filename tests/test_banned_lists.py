@@ -0,0 +1,64 @@
+import gzip, os
+
+import pytest
+
+import banned_lists
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    # Every get_banned call rechecks the directory
+    monkeypatch.setattr(banned_lists, "BANNED_RELOAD_INTERVAL", 0)
+    monkeypatch.setattr(banned_lists, "_current", banned_lists.BannedLists())
+    monkeypatch.setattr(banned_lists, "_checked", None)
+    return str(tmp_path)
+
+
+def _lookup(directory, password):
+    return banned_lists.get_banned(directory).lookup(password)
+
+
+def test_edited_lists_are_reloaded(directory):
+    path = os.path.join(directory, "products.txt")
+    assert _lookup(directory, "acme") is None
+    with open(path, "wb") as f:
+        f.write(b"acme\n")
+    assert _lookup(directory, "acme") == (["products"], "exact")
+    assert _lookup(directory, "Acme2024!") == (["products"], "variant")
+
+    old = banned_lists.get_banned(directory)
+    with open(path, "wb") as f:
+        f.write(b"widgetco\n")
+    assert _lookup(directory, "acme") is None
+    assert _lookup(directory, "widgetco") == (["products"], "exact")
+    # A request still holding the old lists finishes with them
+    assert old.lookup("acme") == (["products"], "exact")
+
+    os.unlink(path)
+    assert _lookup(directory, "widgetco") is None
+    assert banned_lists.status(directory)["lists"] == {}
+
+
+def test_write_and_delete(directory):
+    assert banned_lists.write_list("phished", [b"hunter2"], directory=directory) == 1
+    assert banned_lists.write_list("phished", [b"letmein", b"hunter2"], append=True, directory=directory) == 2
+    assert _lookup(directory, "letmein") == (["phished"], "exact")
+    assert banned_lists.delete_list("phished", directory) is True
+    assert _lookup(directory, "hunter2") is None
+    assert banned_lists.delete_list("phished", directory) is False
+
+
+def test_delete_finds_lists_under_any_suffix(directory):
+    with gzip.open(os.path.join(directory, "vendor.txt.gz"), "wb") as f:
+        f.write(b"initech\n")
+    assert banned_lists.status(directory)["lists"] == {"vendor": 1}
+    assert banned_lists.delete_list("vendor", directory) is True
+    assert os.listdir(directory) == []
+    assert _lookup(directory, "initech") is None
+
+
+def test_unsafe_file_names_are_skipped(directory):
+    with open(os.path.join(directory, "<img src=x onerror=alert(1)>.txt"), "wb") as f:
+        f.write(b"initech\n")
+    assert _lookup(directory, "initech") is None
+    assert banned_lists.status(directory)["lists"] == {}
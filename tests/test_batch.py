@@ -0,0 +1,45 @@
+import asyncio, json
+
+import app, asgi
+
+
+def _asgi_post(body, content_type):
+    scope = {"type": "http", "method": "POST", "path": "/check/batch",
+             "headers": [(b"content-type", content_type.encode())]}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.application(scope, receive, send))
+    return sent[0]["status"], b"".join(message.get("body", b"") for message in sent[1:])
+
+
+def test_malformed_batch_bodies_are_rejected():
+    client = app.app.test_client()
+    for body in (b"{not json", b'{"password": "hunter2"}'):
+        response = client.post("/check/batch", data=body, content_type="application/json")
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+        status, payload = _asgi_post(body, "application/json")
+        assert status == 400
+        assert "error" in json.loads(payload)
+
+
+def test_batch_streams_one_line_per_item():
+    client = app.app.test_client()
+    response = client.post("/check/batch", data=b'["hunter2", {"id": 7, "password": 3}]',
+                           content_type="application/json")
+    assert response.status_code == 200
+    lines = sorted((json.loads(line) for line in response.data.splitlines()), key=lambda line: line["index"])
+    assert [line["index"] for line in lines] == [0, 1]
+    assert lines[1] == {"index": 1, "id": 7, "error": "password must be a string"}
+
+    status, payload = _asgi_post(b'"hunter2"\n{bad\n', "application/x-ndjson")
+    assert status == 200
+    lines = sorted((json.loads(line) for line in payload.splitlines()), key=lambda line: line["index"])
+    assert "rating" in lines[0] and lines[1] == {"index": 1, "error": "invalid JSON"}
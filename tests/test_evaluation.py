@@ -0,0 +1,59 @@
+import banned_lists, evaluation, result_cache
+
+
+class _Filter:
+    # Says "maybe" to everything
+    def __init__(self):
+        self.false_positives = 0
+
+    def might_contain_password(self, password):
+        return True
+
+
+class _Index:
+    def lookup(self, password):
+        return ["rockyou.txt"] if password == "hunter2" else []
+
+
+def test_false_positives_need_an_exact_miss(monkeypatch):
+    bloom = _Filter()
+    monkeypatch.setattr(evaluation, "get_filter", lambda: bloom)
+    monkeypatch.setattr(evaluation, "get_index", lambda: None)
+    assert evaluation.check_in_wordlists("correct horse", scan=False) == []
+    assert bloom.false_positives == 0
+
+    monkeypatch.setattr(evaluation, "get_index", lambda: _Index())
+    assert evaluation.check_in_wordlists("hunter2") == ["rockyou.txt"]
+    assert bloom.false_positives == 0
+    assert evaluation.check_in_wordlists("correct horse") == []
+    assert bloom.false_positives == 1
+
+
+class _Banned:
+    def __init__(self, passwords):
+        self.passwords, self.lookups = passwords, 0
+
+    def lookup(self, password):
+        self.lookups += 1
+        return (["phished"], "exact") if password in self.passwords else None
+
+
+def test_cached_checks_look_up_banned_lists_once(monkeypatch):
+    banned = _Banned({"Acme2024!"})
+    monkeypatch.setattr(banned_lists, "get_banned", lambda: banned)
+    monkeypatch.setattr(evaluation, "_cache", result_cache.ResultCache(result_cache.LRUCache()))
+    monkeypatch.setattr(evaluation, "get_filter", lambda: None)
+    monkeypatch.setattr(evaluation, "get_index", lambda: _Index())
+
+    for password in ("hunter2", "hunter2", "Acme2024!"):
+        before = banned.lookups
+        evaluation.analyze_password_cached(password)
+        assert banned.lookups == before + 1
+    assert evaluation.analyze_password_cached("Acme2024!")["banned"]["lists"] == ["phished"]
+
+    # Banned after its result was cached
+    banned.passwords.add("hunter2")
+    before = banned.lookups
+    events = dict(evaluation.analyze_password_progressive("hunter2"))
+    assert banned.lookups == before + 1
+    assert events["result"]["banned"]["lists"] == ["phished"]
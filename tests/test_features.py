@@ -0,0 +1,28 @@
+import random, string
+
+import pytest
+
+from features import PasswordFeatures, classify_batch
+
+
+def _counts(features):
+    return (features.length, features.upper_count, features.lower_count, features.digit_count,
+            features.symbol_count)
+
+
+def test_classify_batch_matches_the_scalar_features():
+    pytest.importorskip("numpy")
+    rng = random.Random(3)
+    alphabet = string.printable + "éÄß€漢😀"
+    passwords = ["", "a", "Z", "9", "!", " ", "\t\n", "P@ssw0rd!", "ÄÖÜäöü", "pass word", "x" * 300]
+    passwords += ["".join(rng.choices(string.printable, k=rng.randint(1, 40))) for _ in range(500)]
+    passwords += ["".join(rng.choices(alphabet, k=rng.randint(1, 20))) for _ in range(200)]
+    rng.shuffle(passwords)
+    assert [_counts(features) for features in classify_batch(passwords)] == \
+        [_counts(PasswordFeatures(password)) for password in passwords]
+
+
+def test_classify_batch_handles_empty_and_single_batches():
+    assert classify_batch([]) == []
+    [features] = classify_batch(iter(["Tr0ub4dor&3"]))
+    assert _counts(features) == _counts(PasswordFeatures("Tr0ub4dor&3"))
@@ -0,0 +1,102 @@
+import hashlib, io, os, random, threading, zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import post_install, wordlist_index
+
+
+def _archive():
+    rng = random.Random(7)
+    words = [f"{rng.choice(['dragon', 'monkey', 'shadow', 'master'])}{rng.randrange(10 ** 6)}" for _ in range(40000)]
+    buffer = io.BytesIO()
+    # Stored, so the archive is large enough to be cut off mid-stream
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr("rockyou.txt", "\n".join(words[:25000]) + "\n")
+        archive.writestr("SecLists/Passwords/common.txt", "\r\n".join(words[20000:]))
+        archive.writestr("SecLists/Passwords/short.txt", "123456\npassword\n")
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Serves server.archive with Range support; drops the first full transfer halfway
+    def do_GET(self):
+        server = self.server
+        data, header = server.archive, self.headers.get("Range")
+        server.ranges.append(header)
+        offset = int(header[len("bytes="):].rstrip("-")) if header else 0
+        if offset >= len(data):
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(206 if header else 200)
+        if header:
+            self.send_header("Content-Range", f"bytes {offset}-{len(data) - 1}/{len(data)}")
+        self.send_header("Content-Length", str(len(data) - offset))
+        self.end_headers()
+        if server.drops:
+            server.drops -= 1
+            self.wfile.write(data[offset:offset + len(data) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(data[offset:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(post_install.time, "sleep", lambda seconds: None)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.archive, httpd.ranges, httpd.drops = _archive(), [], 1
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/wordlists.zip"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_resumes_after_a_dropped_connection(server, tmp_path):
+    archive_path = str(tmp_path / "wordlists.zip")
+    sha256 = hashlib.sha256(server.archive).hexdigest()
+    assert post_install.download(server.url, archive_path, sha256, retries=3) == sha256
+    assert server.ranges[0] is None
+    resumed_at = int(server.ranges[1][len("bytes="):].rstrip("-"))
+    assert 0 < resumed_at < len(server.archive)
+    with open(archive_path, "rb") as f:
+        assert f.read() == server.archive
+    assert not os.path.exists(f"{archive_path}.part")
+
+
+def test_checksum_mismatch_aborts(server, tmp_path):
+    server.drops = 0
+    archive_path = str(tmp_path / "wordlists.zip")
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        post_install.download(server.url, archive_path, "0" * 64, retries=3)
+    assert not os.path.exists(archive_path)
+    assert not os.path.exists(f"{archive_path}.part")
+
+
+def test_installed_index_matches_a_direct_build(server, tmp_path):
+    dest = str(tmp_path / "wordlists")
+    sources = [os.path.join(dest, "rockyou.txt"), os.path.join(dest, "SecLists")]
+    installed, direct = str(tmp_path / "installed.idx"), str(tmp_path / "direct.idx")
+    post_install.download_and_extract(server.url, hashlib.sha256(server.archive).hexdigest(), dest, True,
+                                      sources, installed, str(tmp_path / "installed.json"))
+    assert len(server.ranges) == 2
+    wordlist_index.build_index(sources, direct, manifest_path=str(tmp_path / "direct.json"))
+
+    first, second = wordlist_index.open_index(installed), wordlist_index.open_index(direct)
+    try:
+        assert first.sources == second.sources
+        assert ([(digest, first.labels_for(set_id)) for digest, set_id in first.iter_records()]
+                == [(digest, second.labels_for(set_id)) for digest, set_id in second.iter_records()])
+    finally:
+        first.close()
+        second.close()
+    assert wordlist_index.load_manifest(str(tmp_path / "installed.json")) == \
+        wordlist_index.load_manifest(str(tmp_path / "direct.json"))
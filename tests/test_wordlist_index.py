@@ -0,0 +1,65 @@
+import os
+
+import wordlist_index
+
+
+def _records(path):
+    index = wordlist_index.open_index(path)
+    try:
+        return index.sources, [(digest, index.labels_for(set_id)) for digest, set_id in index.iter_records()]
+    finally:
+        index.close()
+
+
+def _write(path, lines):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\n".join(lines) + b"\n")
+
+
+def test_update_index_matches_a_full_rebuild(tmp_path):
+    root = str(tmp_path)
+    lists = os.path.join(root, "SecLists")
+    rockyou = os.path.join(root, "rockyou.txt")
+    old, kept = os.path.join(lists, "old.txt"), os.path.join(lists, "kept.txt")
+    _write(rockyou, [b"123456", b"P@ssw0rd", b"dragon"])
+    _write(old, [b"dragon", b"Monkey99!"])
+    _write(kept, [b"shadow", b"123456"])
+    sources = [rockyou, lists]
+    index, normalized, manifest = (os.path.join(root, name) for name in ("i.idx", "n.idx", "m.json"))
+    # Small chunks so ingesting spills several sorted runs
+    wordlist_index.build_index(sources, index, 2, manifest)
+    wordlist_index.build_normalized_index(sources, normalized, 2)
+
+    _write(rockyou, [b"123456", b"letmein", b"Dragon2024"])  # changed
+    os.unlink(old)  # deleted
+    _write(os.path.join(lists, "new.txt"), [b"sh4dow!", b"qwerty"])  # added
+    os.utime(kept, ns=(1, 1))  # touched, same content
+    summary = wordlist_index.update_index(sources, index, manifest, 2, normalized)
+    assert summary["rebuilt"] is False
+    assert (summary["added"], summary["changed"], summary["deleted"]) == \
+        (["SecLists/new.txt"], ["rockyou.txt"], ["SecLists/old.txt"])
+
+    full, full_normalized = os.path.join(root, "full.idx"), os.path.join(root, "full.n.idx")
+    assert summary["count"] == wordlist_index.build_index(sources, full, 2, os.path.join(root, "full.json"))
+    assert summary["normalized"] == wordlist_index.build_normalized_index(sources, full_normalized, 2)
+    assert _records(index) == _records(full)
+    assert _records(normalized) == _records(full_normalized)
+    assert wordlist_index.load_manifest(manifest) == wordlist_index.load_manifest(os.path.join(root, "full.json"))
+
+    # Nothing left to do
+    summary = wordlist_index.update_index(sources, index, manifest, 2, normalized)
+    assert (summary["added"], summary["changed"], summary["deleted"]) == ([], [], [])
+
+
+def test_update_index_rebuilds_without_a_manifest(tmp_path):
+    root = str(tmp_path)
+    wordlist = os.path.join(root, "rockyou.txt")
+    _write(wordlist, [b"123456", b"dragon"])
+    index, manifest = os.path.join(root, "i.idx"), os.path.join(root, "m.json")
+    wordlist_index.build_index([wordlist], index, manifest_path=manifest)
+    os.unlink(manifest)
+    _write(wordlist, [b"123456", b"dragon", b"qwerty"])
+    summary = wordlist_index.update_index([wordlist], index, manifest)
+    assert summary["rebuilt"] is True and summary["count"] == 3
+    assert wordlist_index.load_manifest(manifest) is not None
@@ -0,0 +1,74 @@
+import io
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import wordlist_scan
+
+WORDLIST = b"alpha\r\nhunter2\nbravo\r\nhunter22\ncharlie"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 64])
+def test_scan_stream_matches_whole_lines_across_chunks(chunk_size):
+    def scan(data, needle):
+        return wordlist_scan.scan_stream(io.BytesIO(data), [needle], chunk_size)
+
+    # CRLF and LF lines, the first line, and a last line without a newline
+    for needle in (b"alpha", b"hunter2", b"bravo", b"hunter22", b"charlie"):
+        assert scan(WORDLIST, needle)
+    assert scan(b"charlie\r", b"charlie")
+    # Prefixes, suffixes and pieces of two lines are not lines
+    for needle in (b"hunter", b"unter2", b"charli", b"alpha\r\nhunter2", b"r2\nbravo"):
+        assert not scan(WORDLIST, needle)
+    assert not scan(b"", b"alpha")
+
+
+def test_scan_range_assigns_each_line_to_one_range(tmp_path):
+    wordlist = tmp_path / "leaked.txt"
+    wordlist.write_bytes(WORDLIST)
+    size = len(WORDLIST)
+    for needle in (b"alpha", b"hunter2", b"bravo", b"hunter22", b"charlie"):
+        for cut in range(size + 1):
+            hits = [wordlist_scan.scan_range(str(wordlist), start, end, [needle], chunk_size=3)
+                    for start, end in ((0, cut), (cut, size))]
+            assert hits.count(True) == 1, (needle, cut)
+    assert not wordlist_scan.scan_range(str(wordlist), 0, size, [b"hunter"])
+
+
+def test_scans_recover_after_the_pool_breaks(tmp_path):
+    wordlist = tmp_path / "leaked.txt"
+    wordlist.write_bytes(b"alpha\nbravo\ncharlie\n")
+    sources = [str(wordlist)]
+    scanner = wordlist_scan.ParallelScanner(workers=2, max_concurrent=2)
+    try:
+        assert scanner.scan("bravo", sources)["found"] == ["leaked.txt"]
+        for process in list(scanner._pool._processes.values()):
+            process.kill()
+            process.join()
+        # More scans than slots: a scan that leaked its slot would block here
+        for _ in range(4):
+            try:
+                assert scanner.scan("bravo", sources)["found"] == ["leaked.txt"]
+            except BrokenProcessPool:
+                pass
+        assert scanner.scan("bravo", sources)["found"] == ["leaked.txt"]
+        assert scanner.scan("delta", sources)["found"] == []
+    finally:
+        scanner.shutdown()
+
+
+def test_scan_reports_the_bytes_it_read(tmp_path):
+    wordlist = tmp_path / "leaked.txt"
+    wordlist.write_bytes(b"bravo\n" + b"filler\n" * 200000)
+    size = wordlist.stat().st_size
+    scanner = wordlist_scan.ParallelScanner(workers=2, max_concurrent=2)
+    try:
+        # An early match stops the task long before the end of its range
+        hit = scanner.scan("bravo", [str(wordlist)], segment_bytes=size, chunk_size=4096)
+        assert hit["found"] == ["leaked.txt"]
+        assert 0 < hit["files"][0]["bytes"] < size
+        miss = scanner.scan("delta", [str(wordlist)], segment_bytes=size // 3, chunk_size=4096)
+        assert miss["found"] == []
+        assert sum(entry["bytes"] for entry in miss["files"]) >= size
+    finally:
+        scanner.shutdown()
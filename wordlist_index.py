@@ -0,0 +1,627 @@
+import argparse, gzip, hashlib, heapq, io, json, lzma, mmap, os, string, struct, sys, tempfile, time
+from operator import itemgetter
+
+from config import (
+    WORDLIST_PATHS, INDEX_PATH, MANIFEST_PATH, INDEX_CHUNK_RECORDS, BLOOM_PATH, RANGE_DIR,
+    NORMALIZED_INDEX_PATH, NORMALIZED_MIN_LENGTH,
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ========================== INDEX FORMAT ==========================
+# One merged index covers every wordlist file. It is a header, then sorted,
+# deduplicated records of (SHA-1 digest, membership set id), then a JSON
+# footer naming the source files and the bitmask behind each set id. Fixed-
+# width records let us binary-search the file straight out of an mmap.
+MAGIC = b"PMIDX\x00"
+VERSION = 2
+DIGEST_SIZE = 20
+RECORD = struct.Struct("<20sI")  # digest, set id (or source id while building)
+HEADER = struct.Struct("<6sHHQQ")  # magic, version, record size, record count, footer length
+HEADER_SIZE = 32
+
+
+def password_digest(data):
+    return hashlib.sha1(data).digest()
+
+
+def password_encodings(password):
+    # Wordlists are raw bytes; most are UTF-8 but older dumps are latin-1
+    encodings = [password.encode("utf-8", errors="ignore")]
+    if not password.isascii():
+        try:
+            encodings.append(password.encode("latin-1"))
+        except UnicodeEncodeError:
+            pass
+    return encodings
+
+
+def password_keys(password):
+    return [password_digest(data) for data in password_encodings(password)]
+
+
+# ========================== NORMALIZED FORMS ==========================
+# Trivial mutations of a breached password normalize back to its base word:
+# trailing digits and symbols are stripped, ASCII is lowercased and common
+# leet substitutions are undone ("P@ssw0rd!" -> "password"). Wordlist lines
+# and queried passwords go through the same function, as bytes.
+_TRAILING = (string.digits + string.punctuation + " ").encode()
+_LEET = bytes.maketrans(b"@4310!|$57+89", b"aaeioilssttbg")
+
+
+def normalize_line(line):
+    base = line.rstrip(_TRAILING).lower().translate(_LEET)
+    return base if len(base) >= NORMALIZED_MIN_LENGTH else None
+
+
+def normalized_forms(password):
+    forms = []
+    for data in password_encodings(password):
+        base = normalize_line(data)
+        if base is not None and base not in forms:
+            forms.append(base)
+    return forms
+
+
+# ========================== SOURCE READING ==========================
+# Wordlists may be shipped compressed. "rockyou.txt.gz" is read through a
+# streaming decompressor and reported as "rockyou.txt", and a configured
+# source that is missing is looked for with each codec suffix, so
+# WORDLIST_PATHS does not change when the lists are recompressed.
+CODECS = (".gz", ".xz", ".zst")
+
+
+def codec_suffix(file_path):
+    for suffix in CODECS:
+        if file_path.endswith(suffix):
+            return suffix
+    return None
+
+
+def strip_codec_suffix(file_path):
+    suffix = codec_suffix(file_path)
+    return file_path[:-len(suffix)] if suffix else file_path
+
+
+def open_wordlist(file_path, raw=None):
+    # `raw` is the file already opened in binary mode, for callers that track its position
+    suffix = codec_suffix(file_path)
+    source = raw if raw is not None else file_path
+    if suffix == ".gz":
+        return gzip.open(source, "rb")
+    if suffix == ".xz":
+        return lzma.open(source, "rb")
+    if suffix == ".zst":
+        if zstandard is None:
+            raise OSError(f"{file_path}: install the zstandard package to read .zst wordlists")
+        # The zstd reader has no readline; buffering adds line iteration
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw or open(file_path, "rb"), closefd=True))
+    return raw or open(file_path, "rb")
+
+
+def resolve_source(source):
+    if os.path.exists(source):
+        return source
+    for suffix in CODECS:
+        if os.path.exists(source + suffix):
+            return source + suffix
+    return None
+
+
+def iter_source_files(source):
+    source = resolve_source(source)
+    if source is None:
+        return
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for file in sorted(files):
+                yield os.path.join(root, file)
+    else:
+        yield source
+
+
+def source_label(source, file_path):
+    # "rockyou.txt" for single-file sources, "SecLists/Passwords/..." inside directories
+    parent = os.path.dirname(os.path.normpath(source))
+    return strip_codec_suffix(os.path.relpath(file_path, parent).replace(os.sep, "/"))
+
+
+def iter_source_labels(sources):
+    for source in sources:
+        for file_path in iter_source_files(source):
+            yield file_path, source_label(source, file_path)
+
+
+def iter_lines(file_path, hasher=None):
+    # The hasher sees decompressed content, so recompressing a list does not
+    # make update-index think it changed
+    with open_wordlist(file_path) as f:
+        for line in f:
+            if hasher is not None:
+                hasher.update(line)
+            line = line.rstrip(b"\r\n")
+            if line:
+                yield line
+
+
+def file_sha256(file_path):
+    hasher = hashlib.sha256()
+    with open_wordlist(file_path) as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+# ========================== BUILDING ==========================
+def _write_run(records, run_dir):
+    records.sort()
+    fd, run_path = tempfile.mkstemp(suffix=".run", dir=run_dir)
+    with os.fdopen(fd, "wb") as f:
+        previous = None
+        for record in records:
+            if record != previous:
+                f.write(record)
+                previous = record
+    records.clear()
+    return run_path
+
+
+def _iter_run(run_path):
+    size = RECORD.size
+    with open(run_path, "rb") as f:
+        while True:
+            record = f.read(size)
+            if len(record) < size:
+                return
+            yield record
+
+
+def _group_memberships(records):
+    # Sorted (digest, source id) records -> (digest, bitmask of source ids)
+    digest, mask = None, 0
+    for record in records:
+        current, source_id = RECORD.unpack(record)
+        if current != digest:
+            if digest is not None:
+                yield digest, mask
+            digest, mask = current, 0
+        mask |= 1 << source_id
+    if digest is not None:
+        yield digest, mask
+
+
+def _write_index(out_path, sources, entries):
+    # Write next to the target and rename so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(out_path) or ".")
+    set_ids, count = {}, 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\x00" * HEADER_SIZE)
+            for digest, mask in entries:
+                set_id = set_ids.setdefault(mask, len(set_ids))
+                f.write(RECORD.pack(digest, set_id))
+                count += 1
+            masks = sorted(set_ids, key=set_ids.get)
+            footer = json.dumps({"sources": sources, "masks": [format(m, "x") for m in masks]}).encode()
+            f.write(footer)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count, len(footer)))
+        # mkstemp creates 0600 files; server workers may run as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+
+def _add_lines(lines, source_id, records, runs, run_dir, chunk_records):
+    for line in lines:
+        records.append(RECORD.pack(password_digest(line), source_id))
+        if len(records) >= chunk_records:
+            runs.append(_write_run(records, run_dir))
+
+
+def _merge_runs(runs):
+    return _group_memberships(heapq.merge(*(_iter_run(run) for run in runs)))
+
+
+def _normalized_lines(lines):
+    return (base for base in map(normalize_line, lines) if base is not None)
+
+
+def _ingest(files, run_dir, chunk_records, manifest_files, transform=None):
+    # Hash (file_path, label, source_id) entries into sorted runs, recording
+    # each file's size, mtime and content hash in the manifest as we go;
+    # transform, if given, maps each file's lines before hashing
+    runs, records = [], []
+    for file_path, label, source_id in files:
+        st = os.stat(file_path)
+        hasher = hashlib.sha256()
+        lines = iter_lines(file_path, hasher)
+        _add_lines(transform(lines) if transform else lines, source_id, records, runs, run_dir, chunk_records)
+        manifest_files[label] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": hasher.hexdigest()}
+    if records:
+        runs.append(_write_run(records, run_dir))
+    return _merge_runs(runs)
+
+
+class IndexBuilder:
+    # Builds a full index from files handed over one at a time, e.g. by the
+    # installer while it extracts them. add() takes an iterable of stripped,
+    # non-empty lines; finish() may put the sources in a different order than
+    # they arrived in, which only renumbers the membership bitmasks.
+    def __init__(self, out_path=INDEX_PATH, chunk_records=INDEX_CHUNK_RECORDS, manifest_path=MANIFEST_PATH):
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        self.out_path = out_path
+        self.chunk_records = chunk_records
+        self.manifest_path = manifest_path
+        self.labels = []
+        self.files = {}
+        self._runs, self._records = [], []
+        self._run_dir = tempfile.TemporaryDirectory(dir=os.path.dirname(out_path) or ".")
+
+    def add(self, label, lines):
+        source_id = len(self.labels)
+        self.labels.append(label)
+        _add_lines(lines, source_id, self._records, self._runs, self._run_dir.name, self.chunk_records)
+
+    def add_file(self, file_path, label):
+        st = os.stat(file_path)
+        hasher = hashlib.sha256()
+        self.add(label, iter_lines(file_path, hasher))
+        self.record(label, st, hasher.hexdigest())
+
+    def record(self, label, st, sha256):
+        self.files[label] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256}
+
+    def finish(self, order=None):
+        order = self.labels if order is None else order
+        position = {label: i for i, label in enumerate(order)}
+        remap = [position[label] for label in self.labels]
+        masks = {}
+
+        def renumber(mask):
+            if mask not in masks:
+                masks[mask] = sum(1 << new_id for old_id, new_id in enumerate(remap) if mask >> old_id & 1)
+            return masks[mask]
+
+        try:
+            if self._records:
+                self._runs.append(_write_run(self._records, self._run_dir.name))
+            entries = ((digest, renumber(mask)) for digest, mask in _merge_runs(self._runs))
+            count = _write_index(self.out_path, list(order), entries)
+        finally:
+            self.close()
+        if self.manifest_path is not None:
+            save_manifest(self.manifest_path, self.files)
+        return count
+
+    def close(self):
+        self._run_dir.cleanup()
+
+
+def build_index(sources=WORDLIST_PATHS, out_path=INDEX_PATH, chunk_records=INDEX_CHUNK_RECORDS,
+                manifest_path=MANIFEST_PATH):
+    builder = IndexBuilder(out_path, chunk_records, manifest_path)
+    try:
+        for file_path, label in iter_source_labels(sources):
+            builder.add_file(file_path, label)
+    except BaseException:
+        builder.close()
+        raise
+    return builder.finish()
+
+
+def build_normalized_index(sources=WORDLIST_PATHS, out_path=NORMALIZED_INDEX_PATH,
+                           chunk_records=INDEX_CHUNK_RECORDS):
+    # Same format as the exact index, over normalized lines. It has no manifest
+    # of its own: update_index updates it alongside the exact index.
+    builder = IndexBuilder(out_path, chunk_records, manifest_path=None)
+    try:
+        for file_path, label in iter_source_labels(sources):
+            builder.add(label, _normalized_lines(iter_lines(file_path)))
+    except BaseException:
+        builder.close()
+        raise
+    return builder.finish()
+
+
+# ========================== INCREMENTAL UPDATE ==========================
+# The manifest is written after the index is swapped in. If we die in between,
+# the next update sees the touched files as changed again and re-ingests them,
+# which is harmless: their old memberships are cleared before re-adding.
+def load_manifest(manifest_path=MANIFEST_PATH):
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_manifest(manifest_path, files):
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def _remap_entries(index, remap):
+    # Re-express old memberships in the new source numbering; entries whose
+    # only sources were changed or deleted files are dropped
+    masks = {}
+    mm = index._mm
+    for offset in range(HEADER_SIZE, HEADER_SIZE + index.count * RECORD.size, RECORD.size):
+        digest, set_id = RECORD.unpack_from(mm, offset)
+        mask = masks.get(set_id)
+        if mask is None:
+            old_mask, mask = index.masks[set_id], 0
+            for old_id, new_id in enumerate(remap):
+                if new_id is not None and old_mask >> old_id & 1:
+                    mask |= 1 << new_id
+            masks[set_id] = mask
+        if mask:
+            yield digest, mask
+
+
+def _combine(entries):
+    digest, mask = None, 0
+    for current, current_mask in entries:
+        if current != digest:
+            if digest is not None:
+                yield digest, mask
+            digest, mask = current, 0
+        mask |= current_mask
+    if digest is not None:
+        yield digest, mask
+
+
+def _merge_update(index, out_path, labels, to_ingest, stale, chunk_records, manifest_files, transform=None):
+    # Writes `index` with the stale sources' memberships cleared, merged with
+    # freshly ingested to_ingest files, numbered by the new labels
+    new_ids = {label: i for i, label in enumerate(labels)}
+    remap = [None if label in stale else new_ids.get(label) for label in index.sources]
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(out_path) or ".") as run_dir:
+        fresh = _ingest(((path, label, new_ids[label]) for path, label in to_ingest),
+                        run_dir, chunk_records, manifest_files, transform)
+        kept = _remap_entries(index, remap)
+        entries = _combine(heapq.merge(kept, fresh, key=itemgetter(0)))
+        return _write_index(out_path, labels, entries)
+
+
+def update_index(sources=WORDLIST_PATHS, index_path=INDEX_PATH, manifest_path=MANIFEST_PATH,
+                 chunk_records=INDEX_CHUNK_RECORDS, normalized_path=None):
+    # With normalized_path, a normalized index that exists there gets the same
+    # update; summary["normalized"] is its new count, or None if there is none
+    index, manifest = open_index(index_path), load_manifest(manifest_path)
+    normalized = None if normalized_path is None else open_index(normalized_path)
+    if index is None or manifest is None:
+        if index is not None:
+            index.close()
+        count = build_index(sources, index_path, chunk_records, manifest_path)
+        normalized_count = None
+        if normalized is not None:
+            normalized.close()
+            normalized_count = build_normalized_index(sources, normalized_path, chunk_records)
+        return {"rebuilt": True, "count": count, "normalized": normalized_count,
+                "added": [], "changed": [], "deleted": []}
+
+    current = list(iter_source_labels(sources))
+    indexed = set(index.sources)
+    files, added, changed, to_ingest = {}, [], [], []
+    for file_path, label in current:
+        st, old = os.stat(file_path), manifest.get(label)
+        if old is not None and label in indexed and old["size"] == st.st_size:
+            if old["mtime_ns"] == st.st_mtime_ns:
+                files[label] = old
+                continue
+            # Touched but identical content only needs its mtime refreshed
+            if file_sha256(file_path) == old["sha256"]:
+                files[label] = {**old, "mtime_ns": st.st_mtime_ns}
+                continue
+        (changed if label in indexed else added).append(label)
+        to_ingest.append((file_path, label))
+    labels = [label for _, label in current]
+    present = set(labels)
+    deleted = [label for label in index.sources if label not in present]
+
+    summary = {"rebuilt": False, "count": index.count, "added": added, "changed": changed, "deleted": deleted,
+               "normalized": None if normalized is None else normalized.count}
+    if not (added or changed or deleted):
+        index.close()
+        if normalized is not None:
+            normalized.close()
+        if files != manifest:
+            save_manifest(manifest_path, files)
+        return summary
+
+    stale = set(changed) | set(deleted)
+    try:
+        summary["count"] = _merge_update(index, index_path, labels, to_ingest, stale, chunk_records, files)
+    finally:
+        index.close()
+    if normalized is not None:
+        # Same diff over normalized lines (the manifest is already filled in),
+        # unless it was built from other sources and the diff doesn't apply
+        incremental = normalized.sources == index.sources
+        try:
+            if incremental:
+                summary["normalized"] = _merge_update(normalized, normalized_path, labels, to_ingest, stale,
+                                                      chunk_records, {}, _normalized_lines)
+        finally:
+            normalized.close()
+        if not incremental:
+            summary["normalized"] = build_normalized_index(sources, normalized_path, chunk_records)
+    save_manifest(manifest_path, files)
+    return summary
+
+
+# ========================== LOOKUP ==========================
+class BreachIndex:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, record_size, count, footer_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                raise ValueError(f"{path} is not a PassMimi index (version {VERSION})")
+            f.seek(HEADER_SIZE + count * RECORD.size)
+            footer = json.loads(f.read(footer_length))
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = count
+        self.sources = footer["sources"]
+        self.masks = [int(m, 16) for m in footer["masks"]]
+        self._labels = {}
+
+    def __len__(self):
+        return self.count
+
+    def _find(self, digest):
+        mm, lo, hi = self._mm, 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER_SIZE + mid * RECORD.size
+            record = mm[offset:offset + DIGEST_SIZE]
+            if record < digest:
+                lo = mid + 1
+            elif record > digest:
+                hi = mid
+            else:
+                return RECORD.unpack_from(mm, offset)[1]
+        return None
+
+    def __contains__(self, digest):
+        return self._find(digest) is not None
+
+    def __iter__(self):
+        for offset in range(HEADER_SIZE, HEADER_SIZE + self.count * RECORD.size, RECORD.size):
+            yield self._mm[offset:offset + DIGEST_SIZE]
+
+    def iter_records(self):
+        # (digest, set id) in digest order
+        for offset in range(HEADER_SIZE, HEADER_SIZE + self.count * RECORD.size, RECORD.size):
+            yield RECORD.unpack_from(self._mm, offset)
+
+    def labels_for(self, set_id):
+        if set_id not in self._labels:
+            mask, sources = self.masks[set_id], self.sources
+            self._labels[set_id] = [sources[i] for i in range(len(sources)) if mask >> i & 1]
+        return self._labels[set_id]
+
+    def lookup(self, password):
+        # Every source list that contains the password, in WORDLIST_PATHS order
+        return self.lookup_keys(password_keys(password))
+
+    def lookup_keys(self, keys):
+        found = []
+        for key in keys:
+            set_id = self._find(key)
+            if set_id is not None:
+                found.extend(label for label in self.labels_for(set_id) if label not in found)
+        return found
+
+    def contains_password(self, password):
+        return any(key in self for key in password_keys(password))
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+def open_index(path=INDEX_PATH):
+    if not os.path.exists(path):
+        return None
+    return BreachIndex(path)
+
+
+def iter_digests(sources=WORDLIST_PATHS, index_path=INDEX_PATH):
+    # Prefer the prebuilt index: it is already hashed and deduplicated
+    index = open_index(index_path)
+    if index is not None:
+        try:
+            yield from index
+        finally:
+            index.close()
+        return
+    for file_path, _ in iter_source_labels(sources):
+        for line in iter_lines(file_path):
+            yield password_digest(line)
+
+
+# ========================== CLI ==========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the PassMimi breached-password index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="merge every wordlist source into one index")
+    build.add_argument("sources", nargs="*", default=WORDLIST_PATHS)
+    build.add_argument("--out", default=INDEX_PATH)
+    build.add_argument("--chunk-records", type=int, default=INDEX_CHUNK_RECORDS)
+    build.add_argument("--manifest", default=MANIFEST_PATH)
+    normalized = sub.add_parser("build-normalized", help="index normalized forms to catch leet and case variants")
+    normalized.add_argument("sources", nargs="*", default=WORDLIST_PATHS)
+    normalized.add_argument("--out", default=NORMALIZED_INDEX_PATH)
+    normalized.add_argument("--chunk-records", type=int, default=INDEX_CHUNK_RECORDS)
+    update = sub.add_parser("update-index", help="re-ingest only wordlist files that were added, changed or deleted")
+    update.add_argument("sources", nargs="*", default=WORDLIST_PATHS)
+    update.add_argument("--out", default=INDEX_PATH)
+    update.add_argument("--manifest", default=MANIFEST_PATH)
+    update.add_argument("--chunk-records", type=int, default=INDEX_CHUNK_RECORDS)
+    # Derived files sit next to --out unless given; the configured paths go with the default --out
+    update.add_argument("--bloom", help="bloom filter to rebuild if it exists")
+    update.add_argument("--normalized", help="normalized index to update if it exists")
+    update.add_argument("--range-dir", help="hash-prefix bucket directory to rebuild if it exists")
+    args = parser.parse_args(argv)
+
+    sources = [source for source in args.sources if resolve_source(source) is not None]
+    for source in args.sources:
+        if source not in sources:
+            print(f"[WARN] Skipping missing wordlist source: {source}")
+    started = time.perf_counter()
+    if args.command == "build":
+        count = build_index(sources, args.out, args.chunk_records, args.manifest)
+        print(f"[INFO] Indexed {count} unique passwords from {len(sources)} sources -> {args.out} "
+              f"in {time.perf_counter() - started:.1f}s")
+        return 0
+    if args.command == "build-normalized":
+        count = build_normalized_index(sources, args.out, args.chunk_records)
+        print(f"[INFO] Indexed {count} unique base words from {len(sources)} sources -> {args.out} "
+              f"in {time.perf_counter() - started:.1f}s")
+        return 0
+
+    out_dir = os.path.dirname(args.out) or "."
+    default_out = os.path.abspath(args.out) == os.path.abspath(INDEX_PATH)
+    bloom_path = args.bloom or (BLOOM_PATH if default_out else os.path.join(out_dir, "breach.bloom"))
+    normalized_path = args.normalized or (NORMALIZED_INDEX_PATH if default_out
+                                          else os.path.join(out_dir, "breach.normalized.idx"))
+    range_dir = args.range_dir or (RANGE_DIR if default_out else os.path.join(out_dir, "range"))
+    summary = update_index(sources, args.out, args.manifest, args.chunk_records, normalized_path)
+    if summary["rebuilt"]:
+        print(f"[INFO] No usable index or manifest; rebuilt {summary['count']} unique passwords")
+    else:
+        print(f"[INFO] {len(summary['added'])} added, {len(summary['changed'])} changed, "
+              f"{len(summary['deleted'])} deleted; index holds {summary['count']} unique passwords")
+    print(f"[INFO] Updated {args.out} in {time.perf_counter() - started:.1f}s")
+    if not (summary["rebuilt"] or summary["added"] or summary["changed"] or summary["deleted"]):
+        return 0
+    # Other derived files that exist are rebuilt so they never disagree with the index
+    if os.path.exists(bloom_path):
+        # A stale filter would reject newly added passwords outright
+        import breach_filter
+        bloom = breach_filter.build_filter(sources, index_path=args.out)
+        bloom.save(bloom_path)
+        print(f"[INFO] Rebuilt bloom filter {bloom_path} ({bloom.stats()['entries']} entries)")
+    if summary["normalized"] is not None:
+        print(f"[INFO] Updated normalized index {normalized_path} ({summary['normalized']} base words)")
+    if os.path.isdir(range_dir):
+        import range_buckets
+        range_buckets.build_buckets(args.out, range_dir)
+        print(f"[INFO] Rebuilt hash-prefix buckets in {range_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+import multiprocessing, os, queue, threading, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from config import (
+    WORDLIST_PATHS, SCAN_CHUNK_SIZE, SCAN_MAX_LINE,
+    SCAN_WORKERS, SCAN_SEGMENT_BYTES, SCAN_MAX_CONCURRENT,
+)
+import metrics, wordlist_index
+
+# ========================== STREAMING SCAN ==========================
+# Used when no index has been built. Files are read as raw bytes in fixed-size
+# blocks and matched on whole lines (LF or CRLF), so peak memory is one block
+# plus one partial line no matter how large the wordlist is.
+
+
+def _line_patterns(needles):
+    patterns = []
+    for needle in needles:
+        patterns.append(b"\n" + needle + b"\n")
+        patterns.append(b"\n" + needle + b"\r\n")
+    return patterns
+
+
+def scan_stream(f, needles, chunk_size=SCAN_CHUNK_SIZE, should_stop=None):
+    # A needle with a newline in it could only match across two lines
+    needles = [needle for needle in needles if needle and b"\n" not in needle]
+    if not needles:
+        return False
+    patterns = _line_patterns(needles)
+    # A leading newline lets the first line match like every other line
+    carry, skipping = b"\n", False
+    while True:
+        if should_stop is not None and should_stop():
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        if skipping:
+            # Drop the rest of an overlong line
+            cut = chunk.find(b"\n")
+            if cut < 0:
+                continue
+            chunk, skipping = chunk[cut:], False
+            carry = b""
+        data = carry + chunk
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            carry = data
+        else:
+            complete, carry = data[:cut + 1], data[cut:]
+            if any(pattern in complete for pattern in patterns):
+                return True
+        if len(carry) > SCAN_MAX_LINE:
+            carry, skipping = b"", True
+    # Last line without a trailing newline
+    last = carry[1:].rstrip(b"\r") if carry.startswith(b"\n") else None
+    return last in needles
+
+
+def scan_file(file_path, needles, chunk_size=SCAN_CHUNK_SIZE):
+    with wordlist_index.open_wordlist(file_path) as f:
+        return scan_stream(f, needles, chunk_size)
+
+
+def scan_wordlists(password, sources=WORDLIST_PATHS, chunk_size=SCAN_CHUNK_SIZE):
+    # Stops at the first file that contains the password, like the original scan
+    needles = wordlist_index.password_encodings(password)
+    for file_path, label in wordlist_index.iter_source_labels(sources):
+        started = time.perf_counter()
+        try:
+            with open(file_path, "rb") as raw, wordlist_index.open_wordlist(file_path, raw) as f:
+                found = scan_stream(f, needles, chunk_size)
+                scanned = raw.tell()
+        except OSError:
+            continue
+        metrics.file_scanned(label, scanned, time.perf_counter() - started)
+        if found:
+            return [label]
+    return []
+
+
+# ========================== PARALLEL SCAN ==========================
+# Cold scans are spread over a process pool. Work is split by bytes: large
+# files become several byte ranges and small files are batched together. Each
+# scan owns a slot in a shared flag array; the first worker to find the
+# password raises the flag and every other task stops at its next block.
+class _RangeReader:
+    # Reads up to `end`, then finishes the line that straddles the boundary
+    def __init__(self, f, end):
+        self._f = f
+        self._remaining = end - f.tell()
+        self._last = b"\n"
+        self._done = False
+
+    def read(self, size):
+        if self._remaining > 0:
+            data = self._f.read(min(size, self._remaining))
+            self._remaining = self._remaining - len(data) if data else 0
+            if data:
+                self._last = data[-1:]
+            return data
+        if self._done or self._last == b"\n":
+            return b""
+        data = self._f.read(size)
+        cut = data.find(b"\n")
+        if cut >= 0 or not data:
+            self._done = True
+            return data[:cut + 1] if cut >= 0 else data
+        return data
+
+
+def scan_range(file_path, start, end, needles, chunk_size=SCAN_CHUNK_SIZE, should_stop=None):
+    # Matches lines that start inside [start, end)
+    return _scan_range(file_path, start, end, needles, chunk_size, should_stop)[0]
+
+
+def _scan_range(file_path, start, end, needles, chunk_size, should_stop):
+    # (found, bytes read from disk); a scan that stops early counts only what it read
+    if wordlist_index.codec_suffix(file_path):
+        # Compressed files cannot be entered mid-stream; plan_tasks keeps them whole
+        with open(file_path, "rb") as raw, wordlist_index.open_wordlist(file_path, raw) as f:
+            found = scan_stream(f, needles, chunk_size, should_stop)
+            return found, raw.tell()
+    with open(file_path, "rb") as f:
+        first = max(start - 1, 0)
+        if start > 0:
+            # Skip the tail of the line that began in the previous range
+            f.seek(first)
+            while True:
+                position = f.tell()
+                block = f.read(chunk_size)
+                if not block:
+                    return False, f.tell() - first
+                cut = block.find(b"\n")
+                if cut >= 0:
+                    f.seek(position + cut + 1)
+                    break
+        if f.tell() >= end:
+            return False, f.tell() - first
+        found = scan_stream(_RangeReader(f, end), needles, chunk_size, should_stop)
+        return found, f.tell() - first
+
+
+def plan_tasks(sources=WORDLIST_PATHS, segment_bytes=SCAN_SEGMENT_BYTES):
+    tasks, pieces, pieces_bytes = [], [], 0
+    for file_path, label in wordlist_index.iter_source_labels(sources):
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            continue
+        if wordlist_index.codec_suffix(file_path):
+            # One piece per compressed file, weighted by its compressed size
+            pieces.append((file_path, label, 0, size))
+            pieces_bytes += size
+            if pieces_bytes >= segment_bytes:
+                tasks.append((pieces_bytes, pieces))
+                pieces, pieces_bytes = [], 0
+            continue
+        for start in range(0, max(size, 1), segment_bytes):
+            end = min(start + segment_bytes, size)
+            pieces.append((file_path, label, start, end))
+            pieces_bytes += end - start
+            if pieces_bytes >= segment_bytes:
+                tasks.append((pieces_bytes, pieces))
+                pieces, pieces_bytes = [], 0
+    if pieces:
+        tasks.append((pieces_bytes, pieces))
+    # Largest first keeps the slowest task from starting last
+    tasks.sort(key=lambda task: task[0], reverse=True)
+    return [pieces for _, pieces in tasks]
+
+
+_cancel_flags = None
+
+
+def _init_worker(flags):
+    global _cancel_flags
+    _cancel_flags = flags
+
+
+def _scan_task(pieces, needles, slot, chunk_size):
+    should_stop = lambda: _cancel_flags[slot]
+    timings = []
+    for file_path, label, start, end in pieces:
+        if should_stop():
+            break
+        started = time.perf_counter()
+        try:
+            found, scanned = _scan_range(file_path, start, end, needles, chunk_size, should_stop)
+        except OSError:
+            found, scanned = False, 0
+        timings.append((label, scanned, time.perf_counter() - started))
+        if found:
+            _cancel_flags[slot] = 1
+            return label, timings
+    return None, timings
+
+
+class ParallelScanner:
+    def __init__(self, workers=SCAN_WORKERS, max_concurrent=SCAN_MAX_CONCURRENT):
+        self.workers = workers
+        self._flags = multiprocessing.Array("b", max_concurrent, lock=False)
+        self._slots = queue.Queue()
+        for slot in range(max_concurrent):
+            self._slots.put(slot)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                 initargs=(self._flags,))
+            return self._pool
+
+    def _release_when_done(self, futures, slot):
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    self._slots.put(slot)
+        for future in futures:
+            future.add_done_callback(done)
+
+    def scan(self, password, sources=WORDLIST_PATHS, segment_bytes=SCAN_SEGMENT_BYTES,
+             chunk_size=SCAN_CHUNK_SIZE):
+        started = time.perf_counter()
+        needles = wordlist_index.password_encodings(password)
+        tasks = plan_tasks(sources, segment_bytes)
+        found, files = [], {}
+        if not tasks:
+            return {"found": found, "files": [], "seconds": 0.0}
+        pool = self._get_pool()
+        slot = self._slots.get()
+        self._flags[slot] = 0
+        futures = []
+        try:
+            for pieces in tasks:
+                futures.append(pool.submit(_scan_task, pieces, needles, slot, chunk_size))
+        except BaseException as e:
+            # Stop what was submitted; the slot still waits for it to finish
+            self._flags[slot] = 1
+            for future in futures:
+                future.cancel()
+            if futures:
+                self._release_when_done(futures, slot)
+            else:
+                self._slots.put(slot)
+            if isinstance(e, BrokenProcessPool):
+                self._discard(pool)
+            raise
+        # The slot is only reused once every task has stopped reading its flag
+        self._release_when_done(futures, slot)
+        try:
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                label, timings = future.result()
+                for file_label, size, seconds in timings:
+                    entry = files.setdefault(file_label, {"file": file_label, "bytes": 0, "seconds": 0.0})
+                    entry["bytes"] += size
+                    entry["seconds"] += seconds
+                    metrics.file_scanned(file_label, size, seconds)
+                if label is not None:
+                    found.append(label)
+                    self._flags[slot] = 1
+                    for other in futures:
+                        other.cancel()
+                    break
+        except BrokenProcessPool:
+            self._discard(pool)
+            raise
+        return {"found": found, "files": list(files.values()), "seconds": time.perf_counter() - started}
+
+    def _discard(self, pool):
+        # A worker died and took the pool with it; the next scan starts a new one
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+_scanner = None
+
+
+def get_scanner(workers=SCAN_WORKERS):
+    global _scanner
+    if _scanner is None:
+        _scanner = ParallelScanner(workers)
+    return _scanner
+
+
+def check_wordlists(password, sources=WORDLIST_PATHS, workers=SCAN_WORKERS):
+    if workers <= 1:
+        return scan_wordlists(password, sources)
+    try:
+        return get_scanner(workers).scan(password, sources)["found"]
+    except BrokenProcessPool:
+        return scan_wordlists(password, sources)